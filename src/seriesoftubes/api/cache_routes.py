@@ -57,6 +57,7 @@ async def get_cache_manager() -> CacheManager | None:
             redis_url=config.cache.redis_url,
             db=config.cache.redis_db,
             key_prefix=config.cache.key_prefix,
+            ttl=config.cache.default_ttl,
         )
         return CacheManager(backend, config.cache.default_ttl)
     except Exception as e:
@@ -2,11 +2,15 @@
 
 from seriesoftubes.cache.base import CacheBackend
 from seriesoftubes.cache.factory import get_cache_backend
-from seriesoftubes.cache.memory import MemoryCacheBackend
+from seriesoftubes.cache.memory import (
+    GenerationalMemoryCacheBackend,
+    MemoryCacheBackend,
+)
 from seriesoftubes.cache.redis import RedisCacheBackend
 
 __all__ = [
     "CacheBackend",
+    "GenerationalMemoryCacheBackend",
     "MemoryCacheBackend",
     "RedisCacheBackend",
     "get_cache_backend",
@@ -3,7 +3,10 @@
 from typing import Optional
 
 from seriesoftubes.cache.base import CacheBackend
-from seriesoftubes.cache.memory import MemoryCacheBackend
+from seriesoftubes.cache.memory import (
+    GenerationalMemoryCacheBackend,
+    MemoryCacheBackend,
+)
 from seriesoftubes.cache.redis import REDIS_AVAILABLE, RedisCacheBackend
 
 
@@ -15,7 +18,8 @@ def get_cache_backend(
     """Get a cache backend instance
 
     Args:
-        backend_type: Type of cache backend ("memory", "redis", or "test_redis")
+        backend_type: Type of cache backend ("memory", "memory-gen", "redis",
+            or "test_redis")
         redis_url: Redis connection URL (for redis backend)
         **kwargs: Additional backend-specific arguments
 
@@ -28,15 +32,22 @@ def get_cache_backend(
     """
     if backend_type == "memory":
         # Filter kwargs to only include supported parameters for memory backend
-        memory_kwargs = {k: v for k, v in kwargs.items() if k in ["max_size"]}
+        memory_kwargs = {
+            k: v for k, v in kwargs.items() if k in ("max_size", "policy", "max_bytes")
+        }
         return MemoryCacheBackend(**memory_kwargs)
 
+    elif backend_type == "memory-gen":
+        # Expiry by generations, see GenerationalMemoryCacheBackend
+        memory_kwargs = {k: v for k, v in kwargs.items() if k in ["ttl"]}
+        return GenerationalMemoryCacheBackend(**memory_kwargs)
+
     elif backend_type == "redis":
         if not REDIS_AVAILABLE:
             msg = "Redis backend requested but redis package not installed. Install with: pip install redis"
             raise ImportError(msg)
 
-        redis_kwargs = kwargs.copy()
+        redis_kwargs = {k: v for k, v in kwargs.items() if k != "ttl"}
         if redis_url:
             redis_kwargs["url"] = redis_url
 
@@ -49,7 +60,9 @@ def get_cache_backend(
         return FakeRedisCacheBackend(**kwargs)
 
     else:
-        supported = ["memory", "redis"] if REDIS_AVAILABLE else ["memory"]
+        supported = ["memory", "memory-gen"]
+        if REDIS_AVAILABLE:
+            supported.append("redis")
         supported.append("test_redis")
         msg = f"Unsupported cache backend: {backend_type}. Supported: {', '.join(supported)}"
         raise ValueError(msg)
@@ -57,7 +70,7 @@ def get_cache_backend(
 
 def get_supported_backends() -> list[str]:
     """Get list of supported cache backend types"""
-    backends = ["memory"]
+    backends = ["memory", "memory-gen"]
     if REDIS_AVAILABLE:
         backends.append("redis")
     return backends
@@ -2,8 +2,33 @@
 
 import hashlib
 import json
+import math
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import xxhash
+
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Reused for every hash; json.dumps would build a new encoder per call
+# whenever non-default options are passed
+_CANONICAL_ENCODER = json.JSONEncoder(
+    sort_keys=True, separators=(",", ":"), default=str
+)
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
 
 def generate_cache_key(
     node_type: str,
@@ -31,28 +56,80 @@ def generate_cache_key(
     return ":".join(key_parts)
 
 
-def hash_dict(data: dict[str, Any]) -> str:
+def _canonical_bytes(data: Any) -> bytes:
+    """Serialize data as compact JSON with sorted keys"""
+    if ORJSON_AVAILABLE:
+        try:
+            payload = orjson.dumps(data, option=_ORJSON_OPTIONS, default=str)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder handles
+            pass
+        else:
+            # orjson writes NaN and infinities as null, which would collide
+            # with None; the stdlib encoder keeps them distinct
+            if b"null" not in payload or not _has_non_finite(data):
+                return payload
+    return _CANONICAL_ENCODER.encode(data).encode()
+
+
+def _has_non_finite(data: Any) -> bool:
+    """Whether data contains a NaN or infinite float at any depth"""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_has_non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite(item) for item in data)
+    return False
+
+
+def _digest(payload: bytes, *, secure: bool = False) -> str:
+    """Hex digest of payload for use in cache keys
+
+    Cache keys only need to be stable and well distributed, so xxh3-128 is
+    used when xxhash is installed and BLAKE2b-128 otherwise. ``secure``
+    forces SHA-256 for callers that need a cryptographic hash.
+    """
+    if secure:
+        return hashlib.sha256(payload).hexdigest()
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128_hexdigest(payload)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def _key_prefix(node_type: str, node_name: str, prefix: str | None) -> str:
+    """Leading part of a cache key, shared by every key for one node"""
+    key_parts = [node_type, node_name]
+    if prefix:
+        key_parts.insert(0, prefix)
+
+    return ":".join(key_parts) + ":"
+
+
+def hash_dict(data: dict[str, Any], *, secure: bool = False) -> str:
     """Create a deterministic hash of a dictionary
 
     Args:
         data: Dictionary to hash
+        secure: Use a cryptographic hash (SHA-256) instead of the fast one
 
     Returns:
-        MD5 hash string
+        Hex digest string
     """
-    # Sort keys for deterministic ordering
-    serialized = json.dumps(data, sort_keys=True, default=str)
-    return hashlib.md5(serialized.encode()).hexdigest()
+    # Sorted keys give a deterministic ordering; JSON quoting keeps "1" and 1 apart
+    return _digest(_canonical_bytes(data), secure=secure)
 
 
-def hash_config(config: Any) -> str:
+def hash_config(config: Any, *, secure: bool = False) -> str:
     """Hash a node configuration object
 
     Args:
         config: Node configuration (Pydantic model)
+        secure: Use a cryptographic hash (SHA-256) instead of the fast one
 
     Returns:
-        MD5 hash string
+        Hex digest string
     """
     if hasattr(config, "model_dump"):
         # Pydantic model
@@ -64,7 +141,7 @@ def hash_config(config: Any) -> str:
         # Assume it's already a dict
         config_dict = config
 
-    return hash_dict(config_dict)
+    return hash_dict(config_dict, secure=secure)
 
 
 def hash_context(
@@ -77,16 +154,51 @@ def hash_context(
         exclude_keys: Keys to exclude from hashing (e.g., timestamps)
 
     Returns:
-        MD5 hash string
+        Hex digest string
     """
-    if exclude_keys:
-        filtered_data = {k: v for k, v in context_data.items() if k not in exclude_keys}
+    # Excluded values are dropped before serialization so they are never
+    # traversed; the copy is skipped when none of them are present
+    if exclude_keys and not context_data.keys().isdisjoint(exclude_keys):
+        excluded = frozenset(exclude_keys)
+        filtered_data = {k: v for k, v in context_data.items() if k not in excluded}
     else:
         filtered_data = context_data
 
     return hash_dict(filtered_data)
 
 
+def build_cache_key(
+    node_type: str,
+    node_name: str,
+    config: Any,
+    context_data: dict[str, Any],
+    exclude_keys: list[str] | None = None,
+    prefix: str | None = None,
+) -> str:
+    """Build a node cache key in a single call
+
+    Produces the same key as ``CacheKeyBuilder`` without allocating a
+    builder, for hot paths that build one key per node execution.
+
+    Args:
+        node_type: Type of the node
+        node_name: Name of the node
+        config: Node configuration
+        context_data: Context data dictionary
+        exclude_keys: Context keys to exclude from hashing
+        prefix: Optional prefix for the key
+
+    Returns:
+        Cache key string
+    """
+    return (
+        _key_prefix(node_type, node_name, prefix)
+        + hash_config(config)
+        + ":"
+        + hash_context(context_data, exclude_keys)
+    )
+
+
 class CacheKeyBuilder:
     """Builder class for constructing cache keys"""
 
@@ -123,10 +235,10 @@ class CacheKeyBuilder:
             msg = "Context hash is required"
             raise ValueError(msg)
 
-        return generate_cache_key(
-            self.node_type,
-            self.node_name,
-            self.config_hash,
-            self.context_hash,
-            self.prefix,
+        # Same layout as generate_cache_key, with the per-node part cached
+        return (
+            _key_prefix(self.node_type, self.node_name, self.prefix)
+            + self.config_hash
+            + ":"
+            + self.context_hash
         )
@@ -3,7 +3,8 @@
 from typing import Any, Dict, Optional
 
 from seriesoftubes.cache.base import CacheBackend
-from seriesoftubes.cache.keys import CacheKeyBuilder
+from seriesoftubes.cache.keys import build_cache_key
+from seriesoftubes.cache.memory import MemoryCacheBackend
 
 
 class CacheManager:
@@ -39,13 +40,13 @@ class CacheManager:
         Returns:
             Cached result or None if not found
         """
-        cache_key = (
-            CacheKeyBuilder(node_type, node_name)
-            .with_config(config)
-            .with_context(context_data, exclude_context_keys)
-            .build()
+        cache_key = build_cache_key(
+            node_type, node_name, config, context_data, exclude_context_keys
         )
 
+        # The memory backend is synchronous underneath; skip the coroutine
+        if isinstance(self.backend, MemoryCacheBackend):
+            return self.backend.get_sync(cache_key)
         return await self.backend.get(cache_key)
 
     async def cache_result(
@@ -69,14 +70,14 @@ class CacheManager:
             ttl: Time to live in seconds (uses default if None)
             exclude_context_keys: Context keys to exclude from cache key
         """
-        cache_key = (
-            CacheKeyBuilder(node_type, node_name)
-            .with_config(config)
-            .with_context(context_data, exclude_context_keys)
-            .build()
+        cache_key = build_cache_key(
+            node_type, node_name, config, context_data, exclude_context_keys
         )
 
         cache_ttl = ttl if ttl is not None else self.default_ttl
+        if isinstance(self.backend, MemoryCacheBackend):
+            self.backend.set_sync(cache_key, result, cache_ttl)
+            return
         await self.backend.set(cache_key, result, cache_ttl)
 
     async def invalidate_node(
@@ -99,11 +100,8 @@ class CacheManager:
         Returns:
             True if cache entry was deleted
         """
-        cache_key = (
-            CacheKeyBuilder(node_type, node_name)
-            .with_config(config)
-            .with_context(context_data, exclude_context_keys)
-            .build()
+        cache_key = build_cache_key(
+            node_type, node_name, config, context_data, exclude_context_keys
         )
 
         return await self.backend.delete(cache_key)
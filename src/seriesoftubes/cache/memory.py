@@ -1,62 +1,344 @@
 """In-memory cache backend"""
 
-import asyncio
+import heapq
+import json
 import time
+from collections import OrderedDict
 from typing import Any, Dict, Optional, Tuple
 
 from seriesoftubes.cache.base import CacheBackend
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+EVICTION_POLICIES = ("lru", "tinylfu")
+
+# Upper bound on expired entries purged per write, to keep set() cheap
+EXPIRY_SWEEP_LIMIT = 20
+
+
+def _value_size(value: Any) -> int:
+    """Approximate the memory cost of a value by its JSON-encoded length"""
+    if ORJSON_AVAILABLE:
+        try:
+            return len(orjson.dumps(value, default=str))
+        except orjson.JSONEncodeError:
+            pass
+    return len(json.dumps(value, default=str).encode())
+
+
+class _FrequencySketch:
+    """Count-Min sketch of recent access frequencies
+
+    Counters are 4-bit (saturating at 15) and are all halved once
+    ``10 * capacity`` increments have been recorded, so popularity decays.
+    """
+
+    _MAX_COUNT = 15
+    # One odd multiplier per row; the rows must not share collisions
+    _SEEDS = (
+        0x9E3779B97F4A7C15,
+        0xC2B2AE3D27D4EB4F,
+        0x165667B19E3779F9,
+        0xD6E8FEB86659FD93,
+    )
+    _MASK64 = (1 << 64) - 1
+
+    def __init__(self, capacity: int):
+        width = 16
+        while width < 4 * capacity:
+            width <<= 1
+        # Multiply-shift hashing: each row indexes by the top bits of its product
+        self._shift = 64 - (width.bit_length() - 1)
+        self._rows = [bytearray(width) for _ in self._SEEDS]
+        self._sample_size = 10 * max(capacity, 1)
+        self._additions = 0
+
+    def _indexes(self, key: str) -> list[int]:
+        h = hash(key) & self._MASK64
+        return [((h * seed) & self._MASK64) >> self._shift for seed in self._SEEDS]
+
+    def increment(self, key: str) -> None:
+        """Record one access to key"""
+        for row, index in zip(self._rows, self._indexes(key), strict=True):
+            if row[index] < self._MAX_COUNT:
+                row[index] += 1
+
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._rows = [bytearray(count >> 1 for count in row) for row in self._rows]
+            self._additions //= 2
+
+    def frequency(self, key: str) -> int:
+        """Estimate how often key was accessed recently"""
+        return min(
+            row[index]
+            for row, index in zip(self._rows, self._indexes(key), strict=True)
+        )
+
 
 class MemoryCacheBackend(CacheBackend):
-    """In-memory cache backend using a dictionary
+    """In-memory LRU cache backend using an ordered dictionary
 
     Good for development and testing, but data is not persistent
-    and is not shared between processes.
+    and is not shared between processes. When full, the least recently
+    used entry is evicted.
+
+    With ``policy="tinylfu"``, a new key only displaces that entry if it
+    has been requested at least as often recently (TinyLFU admission),
+    which keeps frequently used entries cached through one-off scans.
+
+    Expired entries are dropped when read, and each write also purges a
+    bounded number of them in expiry order, so entries that are never read
+    again don't linger until LRU eviction.
+
+    ``max_bytes`` additionally bounds the total size of cached values,
+    measured as their JSON-encoded length, so a few large LLM responses
+    can't take up the whole cache. Values larger than the budget are not
+    cached.
+
+    Every operation is synchronous, so none can interleave with another
+    coroutine and no lock is needed. The ``*_sync`` methods let callers on
+    the hot path skip the coroutine round-trip entirely.
     """
 
-    def __init__(self, max_size: int = 1000):
-        self._cache: dict[str, tuple[Any, float | None]] = {}
+    def __init__(
+        self, max_size: int = 1000, policy: str = "lru", max_bytes: int | None = None
+    ):
+        if policy not in EVICTION_POLICIES:
+            msg = f"Unsupported eviction policy: {policy}. Supported: {', '.join(EVICTION_POLICIES)}"
+            raise ValueError(msg)
+
+        # key -> (value, expires_at, size in bytes; 0 without a byte budget)
+        self._cache: OrderedDict[str, tuple[Any, float | None, int]] = OrderedDict()
+        # (expires_at, key) for entries with a TTL; may hold stale pairs for
+        # keys that were since overwritten or deleted until the next compaction
+        self._expiry_heap: list[tuple[float, str]] = []
         self._max_size = max_size
-        self._lock = asyncio.Lock()
+        self._max_bytes = max_bytes
+        self._bytes_used = 0
+        self._sketch = _FrequencySketch(max_size) if policy == "tinylfu" else None
 
-    async def get(self, key: str) -> Any | None:
-        """Get a value from cache"""
-        async with self._lock:
-            if key not in self._cache:
-                return None
+    def get_sync(self, key: str) -> Any | None:
+        """Get a value from cache without going through the event loop"""
+        if self._sketch is not None:
+            self._sketch.increment(key)
+
+        if key not in self._cache:
+            return None
+
+        value, expires_at, _ = self._cache[key]
+
+        # Check if expired
+        if expires_at is not None and time.monotonic() > expires_at:
+            self._discard(key)
+            return None
+
+        self._cache.move_to_end(key)
+        return value
+
+    def set_sync(self, key: str, value: Any, ttl: int | None = None) -> None:
+        """Set a value in cache without going through the event loop"""
+        now = time.monotonic()
+        self._purge_expired(now)
+
+        # Calculate expiration time
+        expires_at = None
+        if ttl is not None:
+            expires_at = now + ttl
+
+        size = 0
+        if self._max_bytes is not None:
+            size = _value_size(value)
+            if size > self._max_bytes:
+                # Would never fit; caching it would only flush everything else
+                self._discard(key)
+                return
+
+        if self._sketch is not None:
+            self._sketch.increment(key)
+
+        if key in self._cache:
+            # Re-inserted below as the most recently used entry
+            self._discard(key)
+        elif self._sketch is not None and self._cache and self._is_full(size):
+            victim = next(iter(self._cache))
+            if self._sketch.frequency(key) < self._sketch.frequency(victim):
+                # Not requested often enough to displace the victim
+                return
+
+        # Evict least recently used entries until the new value fits
+        while self._cache and self._is_full(size):
+            self._discard(next(iter(self._cache)))
+
+        self._cache[key] = (value, expires_at, size)
+        self._bytes_used += size
+        if expires_at is not None:
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+            if len(self._expiry_heap) > 2 * len(self._cache):
+                self._compact_expiry_heap()
+
+    def delete_sync(self, key: str) -> bool:
+        """Delete a value from cache without going through the event loop"""
+        return self._discard(key)
+
+    def _is_full(self, incoming_size: int) -> bool:
+        """Whether adding a value of incoming_size bytes needs an eviction first"""
+        if len(self._cache) >= self._max_size:
+            return True
+        return (
+            self._max_bytes is not None
+            and self._bytes_used + incoming_size > self._max_bytes
+        )
+
+    def _discard(self, key: str) -> bool:
+        """Remove key if present, keeping the byte count in step"""
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes_used -= entry[2]
+        return True
+
+    def _compact_expiry_heap(self) -> None:
+        """Rebuild the expiry heap from live entries, dropping stale pairs
 
-            value, expires_at = self._cache[key]
+        Overwritten and evicted keys leave their pairs behind, so without this
+        the heap would grow with every write instead of with the cache size.
+        Rebuilding once it holds twice as many pairs as entries keeps it
+        bounded at amortized O(1) per write.
+        """
+        self._expiry_heap = [
+            (expires_at, key)
+            for key, (_, expires_at, _) in self._cache.items()
+            if expires_at is not None
+        ]
+        heapq.heapify(self._expiry_heap)
 
-            # Check if expired
-            if expires_at is not None and time.time() > expires_at:
-                del self._cache[key]
-                return None
+    def _purge_expired(self, now: float) -> None:
+        """Drop up to EXPIRY_SWEEP_LIMIT expired entries"""
+        heap = self._expiry_heap
+        for _ in range(EXPIRY_SWEEP_LIMIT):
+            if not heap or heap[0][0] > now:
+                return
 
-            return value
+            expires_at, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            # Skip stale heap entries for keys that were overwritten or deleted
+            if entry is not None and entry[1] == expires_at:
+                self._discard(key)
+
+    async def get(self, key: str) -> Any | None:
+        """Get a value from cache"""
+        return self.get_sync(key)
 
     async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
         """Set a value in cache"""
-        async with self._lock:
-            # Calculate expiration time
-            expires_at = None
-            if ttl is not None:
-                expires_at = time.time() + ttl
+        self.set_sync(key, value, ttl)
+
+    async def delete(self, key: str) -> bool:
+        """Delete a value from cache"""
+        return self.delete_sync(key)
+
+    async def exists(self, key: str) -> bool:
+        """Check if a key exists in cache"""
+        result = await self.get(key)
+        return result is not None
 
-            # Evict oldest entries if at max size
-            if len(self._cache) >= self._max_size and key not in self._cache:
-                # Remove the first (oldest) entry
-                oldest_key = next(iter(self._cache))
-                del self._cache[oldest_key]
+    async def clear(self) -> None:
+        """Clear all cache entries"""
+        self._cache.clear()
+        self._expiry_heap.clear()
+        self._bytes_used = 0
+
+    async def close(self) -> None:
+        """Close the cache backend (no-op for memory cache)"""
+        pass
 
-            self._cache[key] = (value, expires_at)
+    def size(self) -> int:
+        """Get current cache size (for testing/debugging)"""
+        return len(self._cache)
+
+    def bytes_used(self) -> int:
+        """Get the total size of cached values (0 without a byte budget)"""
+        return self._bytes_used
+
+
+class GenerationalMemoryCacheBackend(CacheBackend):
+    """In-memory cache that expires entries in two generations
+
+    Writes go to the current generation. Every ``ttl / 2`` seconds the
+    current generation becomes the previous one and the old previous one
+    is dropped, so an entry that is not read again is gone within ``ttl``
+    seconds without any expiry heap or sweep. A read that hits the previous
+    generation moves the entry back to the current one.
+
+    Each entry also keeps the deadline from the ``ttl`` passed to ``set``
+    (the backend ``ttl`` when omitted) and is never returned past it, so
+    moving a frequently read entry forward can't keep it alive forever.
+    Size is bounded only by how much is written within one backend TTL.
+    """
+
+    def __init__(self, ttl: int = 3600):
+        if ttl <= 0:
+            msg = f"ttl must be positive, got {ttl}"
+            raise ValueError(msg)
+
+        self._ttl = ttl
+        self._half_ttl = ttl / 2
+        # key -> (value, expires_at)
+        self._current: dict[str, tuple[Any, float]] = {}
+        self._previous: dict[str, tuple[Any, float]] = {}
+        self._rotated_at = time.monotonic()
+
+    def _rotate(self, now: float) -> None:
+        """Advance generations if half a TTL has passed since the last rotation"""
+        elapsed = now - self._rotated_at
+        if elapsed < self._half_ttl:
+            return
+
+        # After a full TTL without rotating, both generations have expired
+        self._previous = self._current if elapsed < 2 * self._half_ttl else {}
+        self._current = {}
+        self._rotated_at = now
+
+    async def get(self, key: str) -> Any | None:
+        """Get a value from cache"""
+        now = time.monotonic()
+        self._rotate(now)
+        if key in self._current:
+            entry = self._current[key]
+        elif key in self._previous:
+            entry = self._current[key] = self._previous.pop(key)
+        else:
+            return None
+
+        value, expires_at = entry
+        if now > expires_at:
+            del self._current[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        """Set a value in cache"""
+        now = time.monotonic()
+        self._rotate(now)
+        self._previous.pop(key, None)
+        expires_at = now + (ttl if ttl is not None else self._ttl)
+        self._current[key] = (value, expires_at)
 
     async def delete(self, key: str) -> bool:
         """Delete a value from cache"""
-        async with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
+        self._rotate(time.monotonic())
+        found = False
+        for generation in (self._current, self._previous):
+            if key in generation:
+                del generation[key]
+                found = True
+        return found
 
     async def exists(self, key: str) -> bool:
         """Check if a key exists in cache"""
@@ -65,8 +347,8 @@ class MemoryCacheBackend(CacheBackend):
 
     async def clear(self) -> None:
         """Clear all cache entries"""
-        async with self._lock:
-            self._cache.clear()
+        self._current.clear()
+        self._previous.clear()
 
     async def close(self) -> None:
         """Close the cache backend (no-op for memory cache)"""
@@ -74,4 +356,4 @@ class MemoryCacheBackend(CacheBackend):
 
     def size(self) -> int:
         """Get current cache size (for testing/debugging)"""
-        return len(self._cache)
+        return len(self._current) + len(self._previous)
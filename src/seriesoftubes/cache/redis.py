@@ -14,6 +14,33 @@ except ImportError:
     REDIS_AVAILABLE = False
     RedisType = Any  # Fallback type when Redis not available
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Keys fetched per SCAN call and deleted per DEL call when clearing
+CLEAR_BATCH_SIZE = 1000
+
+
+def _serialize(value: Any) -> str | bytes:
+    """Encode a value as JSON, using orjson when it can handle the value"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(value, default=str)
+
+
+def _deserialize(value: str) -> Any:
+    """Decode a JSON value written by _serialize"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(value)
+    return json.loads(value)
+
 
 class RedisCacheBackend(CacheBackend):
     """Redis cache backend for persistent, distributed caching"""
@@ -61,7 +88,7 @@ class RedisCacheBackend(CacheBackend):
                 return None
 
             # Deserialize JSON
-            return json.loads(value)
+            return _deserialize(value)
         except (json.JSONDecodeError, redis.RedisError):
             # If we can't deserialize or Redis error, treat as cache miss
             return None
@@ -73,9 +100,9 @@ class RedisCacheBackend(CacheBackend):
 
         try:
             # Serialize to JSON
-            serialized_value = json.dumps(value, default=str)
+            serialized_value = _serialize(value)
             await client.set(prefixed_key, serialized_value, ex=ttl)
-        except (json.JSONEncodeError, redis.RedisError) as e:
+        except (TypeError, ValueError, redis.RedisError) as e:
             # Log error but don't fail the operation
             print(f"Cache set failed for key {key}: {e}")
 
@@ -106,13 +133,15 @@ class RedisCacheBackend(CacheBackend):
         client = await self._get_client()
 
         try:
-            # Find all keys with our prefix
+            # Find all keys with our prefix, deleting them a batch at a time
             pattern = f"{self.key_prefix}*"
             keys = []
-            async for key in client.scan_iter(match=pattern):
+            async for key in client.scan_iter(match=pattern, count=CLEAR_BATCH_SIZE):
                 keys.append(key)
+                if len(keys) >= CLEAR_BATCH_SIZE:
+                    await client.delete(*keys)
+                    keys = []
 
-            # Delete in batches
             if keys:
                 await client.delete(*keys)
         except redis.RedisError as e:
@@ -7,6 +7,15 @@ from typing import Any
 import yaml
 from pydantic import BaseModel, Field, ValidationError, field_validator
 
+# libyaml's C loader is much faster; PyYAML builds without it fall back
+_SafeLoader: type[yaml.SafeLoader] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def safe_load(stream: Any) -> Any:
+    """Parse YAML like yaml.safe_load, with the C loader when available"""
+    # Both candidates for _SafeLoader are safe loaders; ruff can't tell
+    return yaml.load(stream, Loader=_SafeLoader)  # noqa: S506
+
 
 class LLMConfig(BaseModel):
     """LLM provider configuration"""
@@ -50,7 +59,7 @@ class CacheConfig(BaseModel):
     """Cache configuration"""
 
     enabled: bool = Field(default=True, description="Enable caching")
-    backend: str = Field(default="memory", description="Cache backend (memory, redis)")
+    backend: str = Field(default="memory", description="Cache backend (memory, memory-gen, redis)")
     redis_url: str = Field(default="redis://localhost:6379", description="Redis URL")
     redis_db: int = Field(default=0, description="Redis database number")
     key_prefix: str = Field(default="s10s:", description="Cache key prefix")
@@ -129,7 +138,7 @@ def load_config(config_path: Path | None = None) -> Config:
 
     try:
         with open(config_path) as f:
-            data = yaml.safe_load(f)
+            data = safe_load(f)
     except yaml.YAMLError as e:
         msg = f"Invalid YAML in config file: {e}"
         raise ValueError(msg) from e
@@ -29,9 +29,28 @@ from seriesoftubes.nodes import (
 )
 from seriesoftubes.storage import StorageError, get_storage_backend
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+def _dump_json(data: Any) -> bytes:
+    """Encode data as indented JSON, using orjson when it can handle the data"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
 class ExecutionContext:
     """Context for workflow execution"""
 
@@ -138,6 +157,7 @@ class WorkflowEngine:
                         redis_url=config.cache.redis_url,
                         db=config.cache.redis_db,
                         key_prefix=config.cache.key_prefix,
+                        ttl=config.cache.default_ttl,
                     )
                     self.cache_manager = CacheManager(backend, config.cache.default_ttl)
                 else:
@@ -959,7 +979,7 @@ async def save_outputs_to_storage(
         metadata_key = f"{base_prefix}/metadata.json"
         await storage.upload(
             key=metadata_key,
-            content=json.dumps(metadata, indent=2).encode("utf-8"),
+            content=_dump_json(metadata),
             content_type="application/json",
         )
         storage_keys["__metadata__"] = metadata_key
@@ -968,7 +988,7 @@ async def save_outputs_to_storage(
         for output_name, output_data in outputs.items():
             # Determine format based on data type
             if isinstance(output_data, (dict, list)):
-                content = json.dumps(output_data, indent=2).encode("utf-8")
+                content = _dump_json(output_data)
                 content_type = "application/json"
                 extension = "json"
             else:
@@ -1058,12 +1078,10 @@ async def run_workflow(
         exec_output_dir.mkdir(parents=True, exist_ok=True)
 
         # Save execution summary
-        with open(exec_output_dir / "execution.json", "w") as f:
-            json.dump(results, f, indent=2)
+        (exec_output_dir / "execution.json").write_bytes(_dump_json(results))
 
         # Save individual node outputs
         for node_name, output in context.outputs.items():
-            with open(exec_output_dir / f"{node_name}.json", "w") as f:
-                json.dump(output, f, indent=2)
+            (exec_output_dir / f"{node_name}.json").write_bytes(_dump_json(output))
 
     return results
@@ -11,6 +11,7 @@ from typing import Any
 import yaml
 from pydantic import ValidationError
 
+from seriesoftubes.config import safe_load
 from seriesoftubes.file_security import (
     FileAccessMode,
     FileSecurityConfig,
@@ -586,7 +587,7 @@ class FileNodeExecutor(NodeExecutor):
             return self._read_jsonl(path, config)
         elif file_format == "yaml":
             with open(path, encoding=config.encoding) as f:
-                return yaml.safe_load(f)
+                return safe_load(f)
         elif file_format == "csv":
             return self._read_csv(path, config)
         elif file_format == "pdf":
@@ -627,7 +628,7 @@ class FileNodeExecutor(NodeExecutor):
         elif file_format == "jsonl":
             return self._parse_jsonl(file_obj, config)
         elif file_format == "yaml":
-            return yaml.safe_load(file_obj)
+            return safe_load(file_obj)
         elif file_format == "csv":
             return self._parse_csv(file_obj, config)
         elif file_format == "pdf":
@@ -7,6 +7,7 @@ from typing import Any, cast
 import yaml
 from pydantic import ValidationError
 
+from seriesoftubes.config import safe_load
 from seriesoftubes.models import (
     BaseNodeConfig,
     Node,
@@ -26,7 +27,7 @@ def parse_workflow_yaml(yaml_path: Path) -> Workflow:
     """Parse and validate a workflow YAML file"""
     try:
         with yaml_path.open() as f:
-            data = yaml.safe_load(f)
+            data = safe_load(f)
     except yaml.YAMLError as e:
         msg = f"Invalid YAML: {e}"
         raise WorkflowParseError(msg) from e
@@ -34,6 +35,22 @@ def parse_workflow_yaml(yaml_path: Path) -> Workflow:
         msg = f"Cannot read file: {e}"
         raise WorkflowParseError(msg) from e
 
+    return _parse_workflow_data(data)
+
+
+def parse_workflow_yaml_str(yaml_text: str) -> Workflow:
+    """Parse and validate workflow YAML held in a string"""
+    try:
+        data = safe_load(yaml_text)
+    except yaml.YAMLError as e:
+        msg = f"Invalid YAML: {e}"
+        raise WorkflowParseError(msg) from e
+
+    return _parse_workflow_data(data)
+
+
+def _parse_workflow_data(data: Any) -> Workflow:
+    """Build a Workflow from loaded YAML data"""
     if not isinstance(data, dict):
         msg = "Workflow must be a YAML object"
         raise WorkflowParseError(msg)
@@ -5,10 +5,13 @@ levels and comprehensive sandboxing to prevent malicious code execution.
 """
 
 import ast
+import logging
 import resource
 import sys
 import time
 from enum import Enum
+from functools import lru_cache
+from types import CodeType
 from typing import Any, Callable
 
 from RestrictedPython import (
@@ -23,6 +26,8 @@ from RestrictedPython.Guards import (
     safer_getattr,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class PythonSecurityLevel(Enum):
     """Security levels for Python code execution"""
@@ -101,9 +106,15 @@ class SecurePythonEngine:
         }
     }
     
+    # Compiled code kept per engine; validation and compilation dominate small snippets
+    CODE_CACHE_SIZE = 512
+
     def __init__(self, default_level: PythonSecurityLevel = PythonSecurityLevel.NORMAL):
         """Initialize the secure Python engine"""
         self.default_level = default_level
+
+        # Workflows run the same node code for every item they process
+        self._compile = lru_cache(maxsize=self.CODE_CACHE_SIZE)(self._compile_code)
     
     def _transform_module_returns(self, code: str) -> str:
         """Transform module-level return statements to result assignments"""
@@ -220,36 +231,7 @@ class SecurePythonEngine:
         if context is None:
             context = {}
         
-        # Transform module-level returns to result assignments
-        code = self._transform_module_returns(code)
-        
-        # Validate code with AST first
-        try:
-            self._validate_code(code, level)
-        except CodeValidationError:
-            # Re-raise validation errors as-is
-            raise
-        
-        # Compile with RestrictedPython
-        try:
-            compiled = compile_restricted_exec(
-                code,
-                filename='<secure_python>',
-            )
-        except SyntaxError as e:
-            msg = f"Syntax error in code: {e}"
-            raise CodeValidationError(msg) from e
-        
-        # Check for compilation errors
-        if compiled.errors:
-            errors = '\n'.join(compiled.errors)
-            msg = f"Code compilation failed:\n{errors}"
-            raise CodeValidationError(msg)
-        
-        # Check for warnings (but don't fail)
-        if compiled.warnings:
-            for warning in compiled.warnings:
-                print(f"Code warning: {warning}")
+        code_obj = self._compile(code, level)
         
         # Prepare execution environment
         safe_locals = self._prepare_locals(context, level, allowed_imports)
@@ -266,7 +248,7 @@ class SecurePythonEngine:
             # This allows functions to reference each other
             namespace = safe_globals.copy()
             namespace.update(safe_locals)
-            exec(compiled.code, namespace)
+            exec(code_obj, namespace)
             
             # Check timeout
             if time.time() - start_time > timeout:
@@ -289,6 +271,45 @@ class SecurePythonEngine:
             msg = f"Code execution failed: {e}"
             raise ExecutionError(msg) from e
     
+    def _compile_code(self, code: str, level: PythonSecurityLevel) -> CodeType:
+        """Transform, validate and compile code with RestrictedPython"""
+        # Transform module-level returns to result assignments
+        code = self._transform_module_returns(code)
+        
+        # Validate code with AST first
+        try:
+            self._validate_code(code, level)
+        except CodeValidationError:
+            # Re-raise validation errors as-is
+            raise
+        
+        # Compile with RestrictedPython
+        try:
+            compiled = compile_restricted_exec(
+                code,
+                filename='<secure_python>',
+            )
+        except SyntaxError as e:
+            msg = f"Syntax error in code: {e}"
+            raise CodeValidationError(msg) from e
+        
+        # Check for compilation errors
+        if compiled.errors:
+            errors = '\n'.join(compiled.errors)
+            msg = f"Code compilation failed:\n{errors}"
+            raise CodeValidationError(msg)
+        
+        # Check for warnings (but don't fail)
+        if compiled.warnings:
+            for warning in compiled.warnings:
+                logger.warning("Code warning: %s", warning)
+        
+        if compiled.code is None:
+            msg = "Code compilation produced no code object"
+            raise CodeValidationError(msg)
+        
+        return compiled.code
+    
     def _validate_code(self, code: str, level: PythonSecurityLevel) -> None:
         """Validate code for security issues beyond RestrictedPython"""
         try:
@@ -7,6 +7,7 @@ flexibility for legitimate use cases.
 
 import re
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
 from jinja2 import Environment, StrictUndefined, Template, TemplateSyntaxError
@@ -72,6 +73,9 @@ class SecureTemplateEngine:
         'round': round,
     }
     
+    # Compiled templates kept per environment; from_string() recompiles otherwise
+    TEMPLATE_CACHE_SIZE = 512
+
     def __init__(self, default_level: TemplateSecurityLevel = TemplateSecurityLevel.SAFE_EXPRESSIONS):
         """Initialize the template engine with a default security level"""
         self.default_level = default_level
@@ -114,6 +118,12 @@ class SecureTemplateEngine:
             undefined=StrictUndefined,
         )
         self.unsafe_env.filters['regex_search'] = self._regex_search_filter
+
+        # Workflows render the same few templates for every item they process
+        compile_cache = lru_cache(maxsize=self.TEMPLATE_CACHE_SIZE)
+        self._compile_safe = compile_cache(self.safe_env.from_string)
+        self._compile_sandboxed = compile_cache(self.sandbox_env.from_string)
+        self._compile_unsafe = compile_cache(self.unsafe_env.from_string)
     
     def _regex_search_filter(self, value: str, pattern: str) -> str | None:
         """Jinja2 filter for regex search.
@@ -198,7 +208,8 @@ class SecureTemplateEngine:
         elif level == TemplateSecurityLevel.SAFE_EXPRESSIONS:
             # Parse template to check for unsafe constructs
             try:
-                ast = self.safe_env.parse(template_str)
+                # Compiling parses the template; the result is reused by render
+                self._compile_safe(template_str)
                 # Could add more AST analysis here
             except TemplateSyntaxError as e:
                 msg = f"Invalid template syntax: {e}"
@@ -267,17 +278,17 @@ class SecureTemplateEngine:
     
     def _render_safe_expressions(self, template_str: str, context: dict[str, Any]) -> str:
         """Render template with safe expressions and filters"""
-        template = self.safe_env.from_string(template_str)
+        template = self._compile_safe(template_str)
         return template.render(**context)
     
     def _render_sandboxed(self, template_str: str, context: dict[str, Any]) -> str:
         """Render template in sandboxed environment"""
-        template = self.sandbox_env.from_string(template_str)
+        template = self._compile_sandboxed(template_str)
         return template.render(**context)
     
     def _render_unsafe(self, template_str: str, context: dict[str, Any]) -> str:
         """Render template without security (legacy compatibility only)"""
-        template = self.unsafe_env.from_string(template_str)
+        template = self._compile_unsafe(template_str)
         return template.render(**context)
     
     def render_dict_template(
@@ -1,6 +1,37 @@
+import pytest
 from hypothesis import Verbosity, settings
+from typer.main import get_command
 
-# Register test profiles
+from seriesoftubes.cli import app
+from seriesoftubes.engine import WorkflowEngine
+
+# Register test profiles; select one with pytest --hypothesis-profile=<name>
 settings.register_profile("dev", max_examples=10)
-settings.register_profile("ci", max_examples=100)
+# No example database on CI: runners start clean, so it is only file I/O.
+# Shared runners also make per-example timings too noisy for a deadline.
+settings.register_profile("ci", max_examples=100, deadline=None, database=None)
 settings.register_profile("debug", max_examples=1000, verbosity=Verbosity.verbose)
+
+
+@pytest.fixture(scope="session")
+def cli():
+    """Click command for the CLI app, converted once per session
+
+    Typer's CliRunner rebuilds the whole command tree from the app on every
+    invoke, which costs more than most of the CLI commands under test, so
+    CLI tests invoke this with click's CliRunner instead.
+    """
+    return get_command(app)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """Workflow engine shared by every test in a module
+
+    Building one registers every node executor and, when caching is on,
+    probes Redis; async tests using it should run on a module-scoped loop.
+    Caching is disabled so results can't leak between tests or examples.
+    """
+    engine = WorkflowEngine()
+    engine.cache_manager = None
+    return engine
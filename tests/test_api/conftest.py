@@ -0,0 +1,30 @@
+"""Shared fixtures for API tests"""
+
+import httpx
+import pytest_asyncio
+
+from seriesoftubes.api.main import app
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shared_client():
+    """Create one in-process async client for the whole session
+
+    Requests go straight to the ASGI app on the test's event loop, without
+    TestClient's thread hop. Per-test isolation comes from the dependency
+    overrides each module's client fixture installs and removes. The app
+    lifespan (config validation, init_db) does not run.
+    """
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+    ) as client:
+        yield client
+
+
+def pytest_configure(config):
+    """Build the OpenAPI schema once, up front
+
+    FastAPI builds and caches the schema on first access; doing it here keeps
+    that one-time cost out of whichever test happens to touch it first.
+    """
+    app.openapi()
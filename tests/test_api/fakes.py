@@ -0,0 +1,112 @@
+"""Lightweight database fakes shared by the API tests"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+
+class FakeResult:
+    """Lightweight stand-in for a SQLAlchemy result"""
+
+    __slots__ = ("_one", "_row", "_scalar", "_scalars")
+
+    def __init__(self, scalars=(), one=None, scalar=0, row=None):
+        self._scalars = list(scalars)
+        self._one = one
+        self._scalar = scalar
+        self._row = row
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._scalars
+
+    def scalar_one_or_none(self):
+        return self._one
+
+    def scalar(self):
+        return self._scalar
+
+    def one_or_none(self):
+        return self._row
+
+
+class FakeSession:
+    """Lightweight stand-in for an AsyncSession
+
+    ``execute`` returns queued results first (in order), then ``result``.
+    Calls are recorded in plain lists/counters for assertions, and
+    ``on_refresh`` can populate server-generated fields on refresh.
+    """
+
+    __slots__ = (
+        "added",
+        "bind",
+        "commits",
+        "deleted",
+        "on_refresh",
+        "queued",
+        "result",
+        "statements",
+    )
+
+    def __init__(self, result=None):
+        self.result = result or FakeResult()
+        self.queued = []
+        self.statements = []
+        self.added = []
+        self.deleted = []
+        self.commits = 0
+        self.on_refresh = None
+        self.bind = None
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return self.queued.pop(0) if self.queued else self.result
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def delete(self, obj):
+        self.deleted.append(obj)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def refresh(self, obj):
+        if self.on_refresh is not None:
+            self.on_refresh(obj)
+
+    async def close(self):
+        pass
+
+
+@dataclass(slots=True)
+class FakeUser:
+    """Plain stand-in for a ``User`` row that is never attached to a session"""
+
+    id: str
+    username: str
+    email: str | None = None
+    password_hash: str | None = None
+    is_active: bool = True
+    is_admin: bool = False
+    is_system: bool = False
+    created_at: datetime | None = None
+
+
+@dataclass(slots=True)
+class FakeWorkflow:
+    """Plain stand-in for a ``Workflow`` row that is never attached to a session"""
+
+    id: str
+    name: str
+    version: str
+    user_id: str
+    package_path: str
+    yaml_content: str
+    description: str | None = None
+    is_public: bool = False
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    user: FakeUser | None = None
@@ -0,0 +1,18 @@
+"""Assertion helpers shared by the API tests"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def json_body(response: Any) -> Any:
+    """Decode a response's JSON body, using orjson when it is installed"""
+    if HAS_ORJSON:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
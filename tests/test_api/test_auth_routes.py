@@ -35,7 +35,7 @@ def client(mock_db_session):
     app.dependency_overrides[get_db] = lambda: mock_db_session
     client = TestClient(app)
     yield client
-    app.dependency_overrides.clear()
+    app.dependency_overrides.pop(get_db, None)
 
 
 @pytest.fixture
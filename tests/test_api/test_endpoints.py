@@ -3,6 +3,7 @@
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+import yaml
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -55,16 +56,12 @@ def client(mock_user, mock_db_session):
 
     client = TestClient(app)
     yield client
-    # Clean up
-    app.dependency_overrides.clear()
+    # Clean up only the overrides installed here
+    app.dependency_overrides.pop(get_current_active_user, None)
+    app.dependency_overrides.pop(get_db, None)
 
 
-@pytest.fixture
-def sample_workflow(tmp_path):
-    """Create a sample workflow file"""
-    workflow_path = tmp_path / "test_workflow.yaml"
-    workflow_path.write_text(
-        """
+SAMPLE_WORKFLOW_YAML = """
 name: test-api-workflow
 version: "1.0"
 description: Test workflow for API
@@ -85,8 +82,12 @@ nodes:
 outputs:
   result: echo
 """
-    )
-    return workflow_path
+
+
+@pytest.fixture(scope="session")
+def sample_workflow():
+    """Sample workflow parsed once per session (no disk round-trip)"""
+    return yaml.safe_load(SAMPLE_WORKFLOW_YAML)
 
 
 class TestAPIEndpoints:
@@ -189,37 +190,6 @@ outputs:
         executions = response.json()
         assert isinstance(executions, list)
 
-    def test_get_execution(self, client):
-        """Test getting execution details"""
-        # Test with non-existent execution ID
-        response = client.get("/api/executions/nonexistent-id")
-        assert response.status_code == 404
-
-    def test_get_execution_not_found(self, client):
-        """Test getting non-existent execution"""
-        response = client.get("/api/executions/nonexistent-id")
-        assert response.status_code == 404
-
-    def test_stream_execution_not_found(self, client, mock_user, mock_db_session):
-        """Test streaming non-existent execution"""
-        from seriesoftubes.api.auth import create_access_token
-
-        # Create a valid JWT token for the mock user
-        token = create_access_token(data={"sub": mock_user.id})
-
-        # Create two mock results - one for user lookup (found), one for execution lookup (not found)
-        user_result = MagicMock()
-        user_result.scalar_one_or_none.return_value = mock_user
-
-        execution_result = MagicMock()
-        execution_result.scalar_one_or_none.return_value = None  # Execution not found
-
-        # Set up execute to return user first, then execution not found
-        mock_db_session.execute.side_effect = [user_result, execution_result]
-
-        response = client.get(f"/api/executions/nonexistent-id/stream?token={token}")
-        assert response.status_code == 404
-
     def test_invalid_workflow_yaml(self, client):
         """Test handling invalid workflow YAML"""
         # Try to create workflow with invalid YAML
@@ -6,6 +6,9 @@ import pytest
 
 from seriesoftubes.api.execution import execution_manager
 
+# Share one event loop across the module instead of spinning one up per test
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
 
 @pytest.fixture
 def sample_workflow(tmp_path):
@@ -40,7 +43,6 @@ outputs:
 class TestExecutionManager:
     """Test execution manager functionality"""
 
-    @pytest.mark.asyncio
     async def test_execution_tracking(self, sample_workflow):
         """Test that executions are properly tracked"""
         # Run a workflow
@@ -61,7 +63,6 @@ class TestExecutionManager:
         status = execution_manager.get_status(execution_id)
         assert status["status"] in ["completed", "failed"]
 
-    @pytest.mark.asyncio
     async def test_execution_with_invalid_inputs(self, sample_workflow):
         """Test execution with invalid inputs"""
         # Run with missing required input
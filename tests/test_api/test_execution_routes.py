@@ -1,19 +1,27 @@
 """Tests for execution routes"""
 
+import asyncio
 import json
 import pytest
 from datetime import datetime, timezone
-from fastapi import status
+from types import SimpleNamespace
+from fastapi import HTTPException, status
 from fastapi.testclient import TestClient
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 from uuid import uuid4
 
 from seriesoftubes.api.main import app
 from seriesoftubes.api.auth import get_current_active_user
+from seriesoftubes.api.execution_routes import get_execution, list_executions
 from seriesoftubes.db import User, Workflow, Execution, ExecutionStatus, get_db
+from tests.test_api.fakes import FakeResult, FakeSession
 
+# Fixed timestamp for fixtures; no test asserts on wall-clock time
+_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_NONEXISTENT_ID = "00000000-0000-0000-0000-000000000000"
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def mock_user():
     """Create a mock user for testing"""
     return User(
@@ -29,47 +37,41 @@ def mock_user():
 
 @pytest.fixture
 def mock_db_session():
-    """Create a mock database session"""
-    session = AsyncMock()
-    
-    # Mock query results
-    mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = []
-    mock_result.scalar_one_or_none.return_value = None
-    mock_result.scalar.return_value = 0
-    session.execute.return_value = mock_result
-    
-    # Mock transaction methods
-    session.add = MagicMock()
-    session.commit = AsyncMock()
-    session.refresh = AsyncMock()
-    session.delete = AsyncMock()
-    
-    return session
+    """Create a fake database session"""
+    return FakeSession()
 
 
 @pytest.fixture
-def client(mock_user, mock_db_session):
-    """Create test client with mocked dependencies"""
-    app.dependency_overrides[get_current_active_user] = lambda: mock_user
-    app.dependency_overrides[get_db] = lambda: mock_db_session
-    
-    client = TestClient(app)
-    yield client
+def mocked_dependencies(mock_user, mock_db_session):
+    """Override the app's user and database dependencies with the mocks"""
+    # Snapshot existing overrides so other fixtures' overrides survive teardown
+    previous_overrides = dict(app.dependency_overrides)
+    app.dependency_overrides.update({
+        get_current_active_user: lambda: mock_user,
+        get_db: lambda: mock_db_session,
+    })
+    yield
     app.dependency_overrides.clear()
+    app.dependency_overrides.update(previous_overrides)
 
 
 @pytest.fixture
-def sample_workflow(mock_user):
-    """Create a sample workflow"""
+def client(mocked_dependencies):
+    """Create test client with mocked dependencies"""
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def sample_workflow_template(mock_user):
+    """Create a sample workflow once per session"""
     return Workflow(
         id=str(uuid4()),
         name="test-workflow",
         version="1.0.0",
         description="Test workflow",
         user_id=mock_user.id,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
+        created_at=_NOW,
+        updated_at=_NOW,
         is_public=False,
         package_path="/tmp/test-workflow",
         yaml_content="name: test-workflow\nversion: 1.0.0\n",
@@ -77,41 +79,54 @@ def sample_workflow(mock_user):
 
 
 @pytest.fixture
-def sample_execution(mock_user, sample_workflow):
-    """Create a sample execution"""
+def sample_workflow(sample_workflow_template):
+    """Sample workflow (shared, treat as read-only)"""
+    return sample_workflow_template
+
+
+@pytest.fixture(scope="session")
+def sample_execution_template(mock_user, sample_workflow_template):
+    """Create a sample execution once per session"""
     execution = Execution(
         id=str(uuid4()),
-        workflow_id=sample_workflow.id,
+        workflow_id=sample_workflow_template.id,
         user_id=mock_user.id,
         status=ExecutionStatus.COMPLETED.value,  # Use the string value
-        started_at=datetime.now(timezone.utc),
-        completed_at=datetime.now(timezone.utc),
+        started_at=_NOW,
+        completed_at=_NOW,
         inputs={"message": "test"},
         outputs={"result": "success"},
         errors=None,
         progress={"nodes_completed": 2, "total_nodes": 2}
     )
     # Add relationships for response serialization
-    execution.workflow = sample_workflow
+    execution.workflow = sample_workflow_template
     execution.user = mock_user
     return execution
 
 
+@pytest.fixture
+def sample_execution(sample_execution_template):
+    """Sample execution (shared, treat as read-only)"""
+    return sample_execution_template
+
+
 class TestExecutionRoutes:
     """Test execution routes"""
     
-    def test_list_executions_empty(self, client, mock_db_session):
+    @pytest.mark.asyncio
+    async def test_list_executions_empty(self, mock_db_session, mock_user):
         """Test listing executions when none exist"""
-        response = client.get("/api/executions")
-        assert response.status_code == status.HTTP_200_OK
-        assert response.json() == []
+        # Call the handler directly; HTTP semantics are not under test here
+        result = await list_executions(
+            current_user=mock_user, db=mock_db_session, limit=50, offset=0
+        )
+        assert result == []
         
     def test_list_executions_with_results(self, client, mock_db_session, sample_execution):
         """Test listing executions with results"""
         # Mock query to return executions
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = [sample_execution]
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.result = FakeResult(scalars=[sample_execution])
         
         response = client.get("/api/executions")
         assert response.status_code == status.HTTP_200_OK
@@ -127,92 +142,85 @@ class TestExecutionRoutes:
         assert response.status_code == status.HTTP_200_OK
         
         # Verify query was built with filters
-        execute_call = mock_db_session.execute.call_args[0][0]
+        execute_call = mock_db_session.statements[-1]
         assert execute_call is not None
         
     def test_list_executions_pagination(self, client, mock_db_session, mock_user):
         """Test execution pagination"""
         # Create multiple executions with proper attributes
-        executions = []
-        for i in range(5):
-            workflow = MagicMock()
-            workflow.id = str(uuid4())
-            workflow.name = f"workflow-{i}"
-            workflow.version = "1.0.0"
-            
-            execution = MagicMock()
-            execution.id = str(uuid4())
-            execution.workflow_id = workflow.id
-            execution.workflow = workflow
-            execution.user_id = mock_user.id
-            execution.user = mock_user
-            execution.status = "completed"  # Store as string like the DB does
-            execution.inputs = {"test": f"input-{i}"}
-            execution.outputs = {"result": f"output-{i}"}
-            execution.errors = None
-            execution.progress = {}
-            execution.storage_keys = {}
-            execution.started_at = datetime.now(timezone.utc)
-            execution.completed_at = datetime.now(timezone.utc)
-            executions.append(execution)
-        
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = executions
-        mock_db_session.execute.return_value = mock_result
+        workflow_ids = [str(uuid4()) for _ in range(5)]
+        executions = [
+            SimpleNamespace(
+                id=str(uuid4()),
+                workflow_id=workflow_id,
+                workflow=SimpleNamespace(
+                    id=workflow_id, name=f"workflow-{i}", version="1.0.0"
+                ),
+                user_id=mock_user.id,
+                user=mock_user,
+                status="completed",  # Store as string like the DB does
+                inputs={"test": f"input-{i}"},
+                outputs={"result": f"output-{i}"},
+                errors=None,
+                progress={},
+                storage_keys={},
+                started_at=_NOW,
+                completed_at=_NOW,
+            )
+            for i, workflow_id in enumerate(workflow_ids)
+        ]
+        
+        mock_db_session.result = FakeResult(scalars=executions)
         
         response = client.get("/api/executions?limit=5&offset=0")
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert len(data) == 5
         
-    def test_get_execution_success(self, client, mock_db_session, sample_execution):
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "scenario,expected_status",
+        [
+            ("found", status.HTTP_200_OK),
+            ("missing", status.HTTP_404_NOT_FOUND),
+            # The query filters on the current user's id, so an execution owned
+            # by someone else is simply not found
+            ("not_owner", status.HTTP_404_NOT_FOUND),
+        ],
+    )
+    async def test_get_execution(
+        self, mock_db_session, mock_user, sample_execution, scenario, expected_status
+    ):
         """Test getting a specific execution"""
-        # Mock query to return execution
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_execution
-        mock_db_session.execute.return_value = mock_result
-        
-        response = client.get(f"/api/executions/{sample_execution.id}")
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["id"] == sample_execution.id
-        assert data["status"] == "completed"
-        assert data["outputs"] == {"result": "success"}
-        assert data["progress"] == {"nodes_completed": 2, "total_nodes": 2}
-        
-    def test_get_execution_not_found(self, client, mock_db_session):
-        """Test getting non-existent execution"""
-        execution_id = str(uuid4())
-        response = client.get(f"/api/executions/{execution_id}")
-        assert response.status_code == status.HTTP_404_NOT_FOUND
-        
-    def test_get_execution_not_owner(self, client, mock_db_session, sample_execution):
-        """Test getting execution when not the owner"""
-        # Change execution owner
-        sample_execution.user_id = "different-user-id"
-        
-        # Mock execution query to return execution not owned by user
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None  # Not found for this user
-        mock_db_session.execute.return_value = mock_result
-        
-        response = client.get(f"/api/executions/{sample_execution.id}")
-        assert response.status_code == status.HTTP_404_NOT_FOUND
+        execution_id = (
+            _NONEXISTENT_ID if scenario == "missing" else sample_execution.id
+        )
+        mock_db_session.result = FakeResult(
+            one=sample_execution if scenario == "found" else None
+        )
+
+        if expected_status == status.HTTP_404_NOT_FOUND:
+            with pytest.raises(HTTPException) as exc_info:
+                await get_execution(
+                    execution_id=execution_id, current_user=mock_user, db=mock_db_session
+                )
+            assert exc_info.value.status_code == expected_status
+            return
+
+        result = await get_execution(
+            execution_id=execution_id, current_user=mock_user, db=mock_db_session
+        )
+        assert result.id == sample_execution.id
+        assert result.status == "completed"
+        assert result.outputs == {"result": "success"}
+        assert result.progress == {"nodes_completed": 2, "total_nodes": 2}
         
     def test_stream_execution_not_found(self, client, mock_db_session, mock_user):
         """Test streaming non-existent execution"""
-        execution_id = str(uuid4())
-        
-        # Mock user lookup (for token verification)
-        user_result = MagicMock()
-        user_result.scalar_one_or_none.return_value = mock_user
-        
-        # Mock execution lookup (not found)
-        execution_result = MagicMock()
-        execution_result.scalar_one_or_none.return_value = None
+        execution_id = _NONEXISTENT_ID
         
-        # Set up execute to return user first, then execution not found
-        mock_db_session.execute.side_effect = [user_result, execution_result]
+        # Return user first (for token verification), then execution not found
+        mock_db_session.queued = [FakeResult(one=mock_user), FakeResult(one=None)]
         
         # Need a token for streaming endpoint
         from seriesoftubes.api.auth import create_access_token
@@ -222,3 +230,71 @@ class TestExecutionRoutes:
         # Should return 404 since execution doesn't exist
         assert response.status_code == status.HTTP_404_NOT_FOUND
         
+
+    @pytest.mark.asyncio
+    async def test_stream_execution(
+        self, mocked_dependencies, mock_db_session, mock_user, sample_execution
+    ):
+        """Test streaming an execution, disconnecting after the first event"""
+        from seriesoftubes.api.auth import create_access_token
+        token = create_access_token(data={"sub": mock_user.id})
+        
+        # Return user first, then the execution (found)
+        mock_db_session.queued = [
+            FakeResult(one=mock_user),
+            FakeResult(one=sample_execution),
+        ]
+        
+        # Mock the session the event generator opens to poll execution status
+        stream_session = FakeSession(
+            FakeResult(
+                row=(
+                    sample_execution.id,
+                    "RUNNING",
+                    sample_execution.started_at,
+                    None,
+                    None,
+                    None,
+                    None,
+                    {},
+                )
+            )
+        )
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__.return_value = stream_session
+        
+        # Drive the ASGI app directly so the stream ends as soon as one event
+        # has been sent, instead of waiting on the polling loop
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": f"/api/executions/{sample_execution.id}/stream",
+            "raw_path": f"/api/executions/{sample_execution.id}/stream".encode(),
+            "query_string": f"token={token}".encode(),
+            "root_path": "",
+            "headers": [(b"host", b"testserver")],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+        messages = []
+        first_event_sent = asyncio.Event()
+        
+        async def receive():
+            await first_event_sent.wait()
+            return {"type": "http.disconnect"}
+        
+        async def send(message):
+            messages.append(message)
+            if message["type"] == "http.response.body" and message.get("body"):
+                first_event_sent.set()
+        
+        with patch("seriesoftubes.api.execution_routes.async_session", session_factory):
+            await asyncio.wait_for(app(scope, receive, send), timeout=5)
+        
+        assert messages[0]["type"] == "http.response.start"
+        assert messages[0]["status"] == status.HTTP_200_OK
+        body = next(m["body"] for m in messages if m["type"] == "http.response.body")
+        assert b'"type": "status"' in body
@@ -2,42 +2,43 @@
 
 import io
 import json
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
-from fastapi import status
-from fastapi.testclient import TestClient
+from fastapi import HTTPException, status
 
 from seriesoftubes.api.main import app
 from seriesoftubes.api.auth import get_current_user
-from seriesoftubes.db import User, get_db
-from seriesoftubes.storage.base import StorageFile
+from seriesoftubes.api.file_routes import download_by_key, list_files
+from seriesoftubes.db import get_db
+from seriesoftubes.storage.base import StorageBackend, StorageFile
+from tests.test_api.fakes import FakeSession, FakeUser
+from tests.test_api.helpers import json_body
 
 
-def test_upload_file(client_with_auth, mock_storage_backend):
+@pytest.mark.asyncio
+async def test_upload_file(client_with_auth, make_storage, text_upload):
     """Test file upload endpoint"""
-    # Setup mock storage
-    mock_storage = AsyncMock()
-    mock_storage.upload.return_value = StorageFile(
-        key="user123/uploads/file-id/test.txt",
-        size=100,
-        content_type="text/plain",
-        last_modified="2024-01-01T00:00:00Z"
+    mock_storage = make_storage(
+        upload=StorageFile(
+            key="user123/uploads/file-id/test.txt",
+            size=100,
+            content_type="text/plain",
+            last_modified="2024-01-01T00:00:00Z"
+        )
     )
-    mock_storage_backend.return_value = mock_storage
     
-    # Create file upload
-    file_content = b"Test file content"
-    files = {"file": ("test.txt", file_content, "text/plain")}
-    
-    response = client_with_auth.post(
+    headers, body = text_upload
+    response = await client_with_auth.post(
         "/api/files/upload",
-        files=files,
+        content=body,
+        headers=headers,
         params={"is_public": False}
     )
     
     assert response.status_code == status.HTTP_200_OK
-    data = response.json()
+    data = json_body(response)
     
     assert data["success"] is True
     assert data["filename"] == "test.txt"
@@ -48,28 +49,27 @@ def test_upload_file(client_with_auth, mock_storage_backend):
     # Verify storage was called correctly
     mock_storage.upload.assert_called_once()
     call_args = mock_storage.upload.call_args[1]
-    assert call_args["content"] == file_content
+    assert call_args["content"] == UPLOAD_CONTENT
     assert call_args["content_type"] == "text/plain"
 
 
-def test_upload_public_file(client_with_auth, mock_storage_backend):
+@pytest.mark.asyncio
+async def test_upload_public_file(client_with_auth, make_storage, text_upload):
     """Test uploading a public file"""
-    # Setup mock storage
-    mock_storage = AsyncMock()
-    mock_storage.upload.return_value = StorageFile(
-        key="public/file-id/test.txt",
-        size=100,
-        content_type="text/plain",
-        last_modified="2024-01-01T00:00:00Z"
+    mock_storage = make_storage(
+        upload=StorageFile(
+            key="public/file-id/test.txt",
+            size=100,
+            content_type="text/plain",
+            last_modified="2024-01-01T00:00:00Z"
+        )
     )
-    mock_storage_backend.return_value = mock_storage
-    
-    # Create file upload
-    files = {"file": ("test.txt", b"Public content", "text/plain")}
     
-    response = client_with_auth.post(
+    headers, body = text_upload
+    response = await client_with_auth.post(
         "/api/files/upload",
-        files=files,
+        content=body,
+        headers=headers,
         params={"is_public": True}
     )
     
@@ -80,34 +80,35 @@ def test_upload_public_file(client_with_auth, mock_storage_backend):
     assert call_args["key"].startswith("public/")
 
 
-def test_list_files(client_with_auth, mock_storage_backend):
+@pytest.mark.asyncio
+async def test_list_files(client_with_auth, make_storage):
     """Test file listing endpoint"""
-    # Setup mock storage
-    mock_storage = AsyncMock()
-    mock_storage.list.return_value = [
-        StorageFile(
-            key="user123/uploads/id1/file1.txt",
-            size=100,
-            content_type="text/plain",
-            last_modified="2024-01-01T00:00:00Z"
-        ),
-        StorageFile(
-            key="user123/uploads/id2/file2.json",
-            size=200,
-            content_type="application/json",
-            last_modified="2024-01-02T00:00:00Z"
-        ),
-    ]
-    mock_storage_backend.return_value = mock_storage
-    
-    response = client_with_auth.get("/api/files")
+    mock_storage = make_storage(
+        list=[
+            StorageFile(
+                key="user123/uploads/id1/file1.txt",
+                size=100,
+                content_type="text/plain",
+                last_modified="2024-01-01T00:00:00Z"
+            ),
+            StorageFile(
+                key="user123/uploads/id2/file2.json",
+                size=200,
+                content_type="application/json",
+                last_modified="2024-01-02T00:00:00Z"
+            ),
+        ]
+    )
+    
+    response = await client_with_auth.get("/api/files")
     
     assert response.status_code == status.HTTP_200_OK
-    data = response.json()
+    data = json_body(response)
     
     assert data["success"] is True
     assert len(data["files"]) == 2
     assert data["total"] == 2
+    mock_storage.list.assert_awaited_once_with(prefix="user123/uploads/", max_keys=100)
     
     # Check first file
     file1 = data["files"][0]
@@ -118,43 +119,53 @@ def test_list_files(client_with_auth, mock_storage_backend):
     assert file1["is_public"] is False
 
 
-def test_list_files_with_prefix(client_with_auth, mock_storage_backend):
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "prefix,include_public,expected_prefixes",
+    [
+        ("documents/", False, ["user123/uploads/documents/"]),
+        ("", False, ["user123/uploads/"]),
+        ("documents/", True, ["user123/uploads/documents/", "public/documents/"]),
+    ],
+)
+async def test_list_files_with_prefix(
+    make_storage, mock_user, mock_db_session, prefix, include_public, expected_prefixes
+):
     """Test file listing with prefix filter"""
-    # Setup mock storage
-    mock_storage = AsyncMock()
-    mock_storage.list.return_value = []
-    mock_storage_backend.return_value = mock_storage
-    
-    response = client_with_auth.get(
-        "/api/files",
-        params={"prefix": "documents/"}
+    mock_storage = make_storage(list=[])
+    
+    # Only the storage prefixes are under test, so call the handler directly
+    result = await list_files(
+        prefix=prefix,
+        limit=100,
+        include_public=include_public,
+        current_user=mock_user,
+        db=mock_db_session,
     )
     
-    assert response.status_code == status.HTTP_200_OK
-    
-    # Verify prefix was used in storage call
-    mock_storage.list.assert_called()
-    call_args = mock_storage.list.call_args[1]
-    assert "user123/uploads/documents/" in call_args["prefix"]
+    assert result.total == 0
+    assert [
+        c.kwargs["prefix"] for c in mock_storage.list.call_args_list
+    ] == expected_prefixes
 
 
-def test_download_file(client_with_auth, mock_storage_backend):
+@pytest.mark.asyncio
+async def test_download_file(client_with_auth, make_storage):
     """Test file download endpoint"""
-    # Setup mock storage
-    mock_storage = AsyncMock()
     file_content = b"Downloaded content"
-    mock_storage.download.return_value = file_content
-    mock_storage.list.return_value = [
-        StorageFile(
-            key="user123/uploads/file-id/test.txt",
-            size=len(file_content),
-            content_type="text/plain",
-            last_modified="2024-01-01T00:00:00Z"
-        )
-    ]
-    mock_storage_backend.return_value = mock_storage
+    make_storage(
+        download=file_content,
+        list=[
+            StorageFile(
+                key="user123/uploads/file-id/test.txt",
+                size=len(file_content),
+                content_type="text/plain",
+                last_modified="2024-01-01T00:00:00Z"
+            )
+        ],
+    )
     
-    response = client_with_auth.get("/api/files/file-id/download")
+    response = await client_with_auth.get("/api/files/file-id/download")
     
     assert response.status_code == status.HTTP_200_OK
     assert response.content == file_content
@@ -162,41 +173,39 @@ def test_download_file(client_with_auth, mock_storage_backend):
     assert 'attachment; filename="test.txt"' in response.headers["content-disposition"]
 
 
-def test_download_nonexistent_file(client_with_auth, mock_storage_backend):
+@pytest.mark.asyncio
+async def test_download_nonexistent_file(client_with_auth, make_storage):
     """Test downloading a non-existent file"""
-    # Setup mock storage
-    mock_storage = AsyncMock()
-    mock_storage.list.return_value = []  # No files found
-    mock_storage_backend.return_value = mock_storage
+    make_storage(list=[])  # No files found
     
-    response = client_with_auth.get("/api/files/nonexistent/download")
+    response = await client_with_auth.get("/api/files/nonexistent/download")
     
     assert response.status_code == status.HTTP_404_NOT_FOUND
-    assert "File not found" in response.json()["detail"]
+    assert "File not found" in json_body(response)["detail"]
 
 
-def test_get_file_url(client_with_auth, mock_storage_backend):
+@pytest.mark.asyncio
+async def test_get_file_url(client_with_auth, make_storage):
     """Test getting pre-signed URL for file"""
-    # Setup mock storage
-    mock_storage = AsyncMock()
-    mock_storage.list.return_value = [
-        StorageFile(
-            key="user123/uploads/file-id/test.txt",
-            size=100,
-            content_type="text/plain",
-            last_modified="2024-01-01T00:00:00Z"
-        )
-    ]
-    mock_storage.get_url.return_value = "https://storage.example.com/signed-url"
-    mock_storage_backend.return_value = mock_storage
+    mock_storage = make_storage(
+        list=[
+            StorageFile(
+                key="user123/uploads/file-id/test.txt",
+                size=100,
+                content_type="text/plain",
+                last_modified="2024-01-01T00:00:00Z"
+            )
+        ],
+        get_url="https://storage.example.com/signed-url",
+    )
     
-    response = client_with_auth.get(
+    response = await client_with_auth.get(
         "/api/files/file-id/url",
         params={"expires_in": 7200}
     )
     
     assert response.status_code == status.HTTP_200_OK
-    data = response.json()
+    data = json_body(response)
     
     assert data["url"] == "https://storage.example.com/signed-url"
     assert data["expires_in"] == 7200
@@ -208,24 +217,24 @@ def test_get_file_url(client_with_auth, mock_storage_backend):
     )
 
 
-def test_delete_file(client_with_auth, mock_storage_backend):
+@pytest.mark.asyncio
+async def test_delete_file(client_with_auth, make_storage):
     """Test file deletion endpoint"""
-    # Setup mock storage
-    mock_storage = AsyncMock()
-    mock_storage.list.return_value = [
-        StorageFile(
-            key="user123/uploads/file-id/test.txt",
-            size=100,
-            content_type="text/plain",
-            last_modified="2024-01-01T00:00:00Z"
-        )
-    ]
-    mock_storage_backend.return_value = mock_storage
+    mock_storage = make_storage(
+        list=[
+            StorageFile(
+                key="user123/uploads/file-id/test.txt",
+                size=100,
+                content_type="text/plain",
+                last_modified="2024-01-01T00:00:00Z"
+            )
+        ]
+    )
     
-    response = client_with_auth.delete("/api/files/file-id")
+    response = await client_with_auth.delete("/api/files/file-id")
     
     assert response.status_code == status.HTTP_200_OK
-    data = response.json()
+    data = json_body(response)
     
     assert data["success"] is True
     assert "Deleted 1 file(s)" in data["message"]
@@ -234,29 +243,49 @@ def test_delete_file(client_with_auth, mock_storage_backend):
     mock_storage.delete.assert_called_once_with("user123/uploads/file-id/test.txt")
 
 
-def test_delete_nonexistent_file(client_with_auth, mock_storage_backend):
+@pytest.mark.asyncio
+@pytest.mark.parametrize("file_count", [2, 5])
+async def test_delete_file_multiple_matches(client_with_auth, make_storage, file_count):
+    """Test deleting a file id that matches several stored objects"""
+    keys = [f"user123/uploads/file-id/part-{i}.txt" for i in range(file_count)]
+    mock_storage = make_storage(
+        list=[
+            StorageFile(
+                key=key,
+                size=100,
+                content_type="text/plain",
+                last_modified="2024-01-01T00:00:00Z"
+            )
+            for key in keys
+        ]
+    )
+
+    response = await client_with_auth.delete("/api/files/file-id")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert f"Deleted {file_count} file(s)" in json_body(response)["message"]
+    assert [c.args[0] for c in mock_storage.delete.call_args_list] == keys
+
+
+@pytest.mark.asyncio
+async def test_delete_nonexistent_file(client_with_auth, make_storage):
     """Test deleting a non-existent file"""
-    # Setup mock storage
-    mock_storage = AsyncMock()
-    mock_storage.list.return_value = []  # No files found
-    mock_storage_backend.return_value = mock_storage
+    make_storage(list=[])  # No files found
     
-    response = client_with_auth.delete("/api/files/nonexistent")
+    response = await client_with_auth.delete("/api/files/nonexistent")
     
     assert response.status_code == status.HTTP_404_NOT_FOUND
-    assert "File not found" in response.json()["detail"]
+    assert "File not found" in json_body(response)["detail"]
 
 
-def test_download_by_key(client_with_auth, mock_storage_backend):
+@pytest.mark.asyncio
+async def test_download_by_key(client_with_auth, make_storage):
     """Test downloading file by storage key"""
-    # Setup mock storage
-    mock_storage = AsyncMock()
     file_content = b"Content by key"
-    mock_storage.download.return_value = file_content
-    mock_storage_backend.return_value = mock_storage
+    mock_storage = make_storage(download=file_content)
     
     # Test downloading own file
-    response = client_with_auth.get(
+    response = await client_with_auth.get(
         "/api/files/download-by-key",
         params={"key": "user123/executions/exec-id/outputs/result.json"}
     )
@@ -267,7 +296,7 @@ def test_download_by_key(client_with_auth, mock_storage_backend):
     
     # Test downloading public file
     mock_storage.download.return_value = b"Public content"
-    response = client_with_auth.get(
+    response = await client_with_auth.get(
         "/api/files/download-by-key",
         params={"key": "public/shared/file.txt"}
     )
@@ -276,28 +305,31 @@ def test_download_by_key(client_with_auth, mock_storage_backend):
     assert response.content == b"Public content"
 
 
-def test_download_by_key_access_denied(client_with_auth, mock_storage_backend):
+@pytest.mark.asyncio
+async def test_download_by_key_access_denied(make_storage, mock_user, mock_db_session):
     """Test access denied when downloading another user's file"""
-    # Setup mock storage
-    mock_storage = AsyncMock()
-    mock_storage_backend.return_value = mock_storage
-    
-    # Try to download another user's file
-    response = client_with_auth.get(
-        "/api/files/download-by-key",
-        params={"key": "other-user/executions/exec-id/outputs/result.json"}
-    )
+    mock_storage = make_storage()
+    
+    # The ownership check is plain handler logic, so skip the HTTP layer
+    with pytest.raises(HTTPException) as exc_info:
+        await download_by_key(
+            key="other-user/executions/exec-id/outputs/result.json",
+            current_user=mock_user,
+            db=mock_db_session,
+        )
     
-    assert response.status_code == status.HTTP_403_FORBIDDEN
-    assert "Access denied" in response.json()["detail"]
+    assert exc_info.value.status_code == status.HTTP_403_FORBIDDEN
+    assert "Access denied" in exc_info.value.detail
+    mock_storage.download.assert_not_called()
 
 
-def test_upload_without_filename(client_with_auth, mock_storage_backend):
+@pytest.mark.asyncio
+async def test_upload_without_filename(client_with_auth):
     """Test uploading file without filename"""
     # Create file upload without filename
     files = {"file": (None, b"No filename content", "text/plain")}
     
-    response = client_with_auth.post(
+    response = await client_with_auth.post(
         "/api/files/upload",
         files=files
     )
@@ -306,29 +338,47 @@ def test_upload_without_filename(client_with_auth, mock_storage_backend):
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
-def test_file_upload_storage_error(client_with_auth, mock_storage_backend):
+@pytest.mark.asyncio
+async def test_file_upload_storage_error(client_with_auth, make_storage, text_upload):
     """Test handling storage errors during upload"""
     # Setup mock storage to raise error
-    mock_storage = AsyncMock()
+    mock_storage = make_storage()
     mock_storage.upload.side_effect = Exception("Storage service unavailable")
-    mock_storage_backend.return_value = mock_storage
     
-    files = {"file": ("test.txt", b"Content", "text/plain")}
-    
-    response = client_with_auth.post(
+    headers, body = text_upload
+    response = await client_with_auth.post(
         "/api/files/upload",
-        files=files
+        content=body,
+        headers=headers
     )
     
     assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-    assert "Upload failed" in response.json()["detail"]
+    assert "Upload failed" in json_body(response)["detail"]
 
 
 # Test fixtures
+UPLOAD_CONTENT = b"Test file content"
+
+
+@pytest.fixture(scope="session")
+def text_upload():
+    """Multipart body for a small text upload, encoded once per session
+
+    Returns ``(headers, body)`` to send with ``content=``, skipping the
+    multipart encoder on every request.
+    """
+    request = httpx.Request(
+        "POST",
+        "http://testserver/api/files/upload",
+        files={"file": ("test.txt", UPLOAD_CONTENT, "text/plain")},
+    )
+    return {"content-type": request.headers["content-type"]}, request.read()
+
+
 @pytest.fixture
 def mock_user():
     """Create a mock user for testing"""
-    return User(
+    return FakeUser(
         id="user123",
         username="testuser",
         email="test@example.com",
@@ -340,34 +390,51 @@ def mock_user():
 
 @pytest.fixture
 def mock_db_session():
-    """Create a mock database session"""
-    session = AsyncMock()
-    
-    # Mock the execute method
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = None
-    session.execute.return_value = mock_result
-    
-    # Mock transaction methods
-    session.add = MagicMock()
-    session.commit = AsyncMock()
-    session.refresh = AsyncMock()
-    
-    return session
+    """Create a fake database session"""
+    return FakeSession()
 
 
 @pytest.fixture
-def client_with_auth(mock_db_session, mock_user):
+def client_with_auth(shared_client, mock_db_session, mock_user):
     """Create test client with authentication"""
-    app.dependency_overrides[get_db] = lambda: mock_db_session
-    app.dependency_overrides[get_current_user] = lambda: mock_user
-    client = TestClient(app)
-    yield client
-    app.dependency_overrides.clear()
+    overrides = {
+        get_db: lambda: mock_db_session,
+        get_current_user: lambda: mock_user,
+    }
+    app.dependency_overrides.update(overrides)
+    yield shared_client
+    # Only remove the overrides this fixture installed
+    for dependency in overrides:
+        app.dependency_overrides.pop(dependency, None)
 
 
 # Fixture for mocking storage backend
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_storage_backend():
+    """Patch the storage backend factory once for the whole module"""
     with patch('seriesoftubes.api.file_routes.get_storage_backend') as mock:
-        yield mock
\ No newline at end of file
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def reset_storage_backend(mock_storage_backend):
+    """Give each test a clean storage backend mock"""
+    mock_storage_backend.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture
+def make_storage(mock_storage_backend):
+    """Factory installing a spec'd storage mock as the active backend
+
+    Keyword arguments set the return value of the method of the same name,
+    e.g. ``make_storage(list=[], download=b"...")``.
+    """
+
+    def _make_storage(**return_values):
+        storage = AsyncMock(spec=StorageBackend)
+        for method, value in return_values.items():
+            getattr(storage, method).return_value = value
+        mock_storage_backend.return_value = storage
+        return storage
+
+    return _make_storage
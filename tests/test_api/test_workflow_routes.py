@@ -4,20 +4,23 @@ import json
 import pytest
 from datetime import datetime, timezone
 from fastapi import status
-from fastapi.testclient import TestClient
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 from seriesoftubes.api.main import app
 from seriesoftubes.api.auth import get_current_active_user
-from seriesoftubes.db import User, Workflow, get_db
+from seriesoftubes.db import User, get_db
+from tests.test_api.fakes import FakeResult, FakeSession, FakeUser, FakeWorkflow
+from tests.test_api.helpers import json_body
 # WorkflowStatus not used in current implementation
 
+_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
 
 @pytest.fixture
 def mock_user():
     """Create a mock user for testing"""
-    return User(
+    return FakeUser(
         id=str(uuid4()),
         username="testuser",
         email="test@example.com",
@@ -30,37 +33,25 @@ def mock_user():
 
 @pytest.fixture
 def mock_db_session():
-    """Create a mock database session"""
-    session = AsyncMock()
-    
-    # Mock query results
-    mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = []
-    mock_result.scalar_one_or_none.return_value = None
-    mock_result.scalar.return_value = 0
-    session.execute.return_value = mock_result
-    
-    # Mock transaction methods
-    session.add = MagicMock()
-    session.commit = AsyncMock()
-    session.refresh = AsyncMock()
-    session.delete = AsyncMock()
-    
-    return session
+    """Create a fake database session"""
+    return FakeSession()
 
 
 @pytest.fixture
-def client(mock_user, mock_db_session):
+def client(shared_client, mock_user, mock_db_session):
     """Create test client with mocked dependencies"""
-    app.dependency_overrides[get_current_active_user] = lambda: mock_user
-    app.dependency_overrides[get_db] = lambda: mock_db_session
-    
-    client = TestClient(app)
-    yield client
-    app.dependency_overrides.clear()
+    overrides = {
+        get_current_active_user: lambda: mock_user,
+        get_db: lambda: mock_db_session,
+    }
+    app.dependency_overrides.update(overrides)
+    yield shared_client
+    # Only remove the overrides this fixture installed
+    for dependency in overrides:
+        app.dependency_overrides.pop(dependency, None)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_workflow_yaml():
     """Sample workflow YAML content"""
     return """
@@ -85,73 +76,96 @@ outputs:
 """
 
 
+@pytest.fixture(scope="session")
+def workflow_prototype(sample_workflow_yaml):
+    """Column values for the sample workflow, built once per session
+
+    Tests get a fresh ``FakeWorkflow`` built from these values and can mutate
+    it freely.
+    """
+    return {
+        "id": str(uuid4()),
+        "name": "test-workflow",
+        "version": "1.0.0",
+        "description": "A test workflow",
+        "created_at": _NOW,
+        "updated_at": _NOW,
+        "is_public": False,
+        "package_path": "/tmp/test-workflow",
+        "yaml_content": sample_workflow_yaml,
+    }
+
+
 @pytest.fixture
-def sample_workflow(mock_user, sample_workflow_yaml):
+def sample_workflow(mock_user, workflow_prototype):
     """Create a sample workflow for testing"""
-    workflow = Workflow(
-        id=str(uuid4()),
-        name="test-workflow",
-        version="1.0.0",
-        description="A test workflow",
-        user_id=mock_user.id,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-        is_public=False,
-        package_path="/tmp/test-workflow",
-        yaml_content=sample_workflow_yaml,
+    # The user relationship is needed for response serialization
+    return FakeWorkflow(**workflow_prototype, user_id=mock_user.id, user=mock_user)
+
+
+@pytest.fixture
+def patched_parse(monkeypatch):
+    """Replace parse_workflow_yaml in the workflow routes with a MagicMock"""
+    mock_parse = MagicMock()
+    monkeypatch.setattr(
+        "seriesoftubes.api.workflow_routes.parse_workflow_yaml", mock_parse
     )
-    # Add the user relationship for response serialization
-    workflow.user = mock_user
-    return workflow
+    return mock_parse
+
+
+@pytest.fixture
+def patched_validate(monkeypatch):
+    """Replace validate_dag in the workflow routes with a no-op MagicMock"""
+    mock_validate = MagicMock(return_value=None)
+    monkeypatch.setattr("seriesoftubes.api.workflow_routes.validate_dag", mock_validate)
+    return mock_validate
 
 
 class TestWorkflowRoutes:
     """Test workflow routes"""
     
-    def test_list_workflows_empty(self, client, mock_db_session):
+    @pytest.mark.asyncio
+    async def test_list_workflows_empty(self, client, mock_db_session):
         """Test listing workflows when none exist"""
-        response = client.get("/api/workflows")
+        response = await client.get("/api/workflows")
         assert response.status_code == status.HTTP_200_OK
-        assert response.json() == []
+        assert json_body(response) == []
         
-    def test_list_workflows_with_results(self, client, mock_db_session, sample_workflow):
+    @pytest.mark.asyncio
+    async def test_list_workflows_with_results(self, client, mock_db_session, sample_workflow):
         """Test listing workflows with results"""
         # Mock query to return workflows
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = [sample_workflow]
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.result = FakeResult(scalars=[sample_workflow])
         
-        response = client.get("/api/workflows")
+        response = await client.get("/api/workflows")
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = json_body(response)
         assert len(data) == 1
         assert data[0]["name"] == "test-workflow"
         
-    def test_list_workflows_with_filters(self, client, mock_db_session):
+    @pytest.mark.asyncio
+    async def test_list_workflows_with_filters(self, client, mock_db_session):
         """Test listing workflows with query filters"""
-        response = client.get("/api/workflows?search=workflow&is_public=true")
+        response = await client.get("/api/workflows?search=workflow&is_public=true")
         assert response.status_code == status.HTTP_200_OK
         
         # Verify query was built correctly
-        execute_call = mock_db_session.execute.call_args[0][0]
+        execute_call = mock_db_session.statements[-1]
         assert execute_call is not None  # Query was created
         
-    def test_list_workflows_pagination(self, client, mock_db_session):
+    @pytest.mark.asyncio
+    async def test_list_workflows_pagination(self, client, mock_db_session):
         """Test workflow pagination"""
-        # Mock count query
-        mock_count_result = MagicMock()
-        mock_count_result.scalar.return_value = 50
-        
-        # Mock workflow query
-        mock_workflow_result = MagicMock()
-        mock_workflow_result.scalars.return_value.all.return_value = []
-        
-        mock_db_session.execute.side_effect = [mock_count_result, mock_workflow_result]
+        # Mock count query, then workflow query
+        mock_db_session.queued = [FakeResult(scalar=50), FakeResult(scalars=[])]
         
-        response = client.get("/api/workflows?limit=10&offset=20")
+        response = await client.get("/api/workflows?limit=10&offset=20")
         assert response.status_code == status.HTTP_200_OK
         
-    def test_create_workflow_success(self, client, mock_db_session, mock_user, sample_workflow_yaml):
+    @pytest.mark.asyncio
+    async def test_create_workflow_success(
+        self, client, mock_db_session, mock_user, sample_workflow_yaml, monkeypatch
+    ):
         """Test successful workflow creation"""
         workflow_data = {
             "yaml_content": sample_workflow_yaml,
@@ -163,73 +177,71 @@ class TestWorkflowRoutes:
             workflow.id = "new-workflow-id"
             workflow.created_at = datetime.now(timezone.utc)
             workflow.updated_at = datetime.now(timezone.utc)
-            workflow.user = mock_user
+            # A relationship needs a mapped row, not the FakeUser double
+            workflow.user = User(id=mock_user.id, username=mock_user.username)
             
-        mock_db_session.refresh.side_effect = mock_refresh
+        mock_db_session.on_refresh = mock_refresh
         
         # Mock the created workflow
-        with patch("seriesoftubes.parser.parse_workflow_yaml") as mock_parse:
-            mock_parsed = MagicMock()
-            mock_parsed.name = "test-workflow"
-            mock_parsed.version = "1.0.0"
-            mock_parsed.description = "A test workflow"  # This comes from the parsed YAML
-            mock_parse.return_value = mock_parsed
-            
-            with patch("seriesoftubes.parser.validate_dag") as mock_validate:
-                mock_validate.return_value = None
-                
-                response = client.post("/api/workflows", json=workflow_data)
-            
+        mock_parsed = MagicMock()
+        mock_parsed.name = "test-workflow"
+        mock_parsed.version = "1.0.0"
+        mock_parsed.description = "A test workflow"  # This comes from the parsed YAML
+        mock_parse = MagicMock(return_value=mock_parsed)
+        monkeypatch.setattr("seriesoftubes.parser.parse_workflow_yaml", mock_parse)
+        monkeypatch.setattr("seriesoftubes.parser.validate_dag", MagicMock())
+        
+        response = await client.post("/api/workflows", json=workflow_data)
+        
         assert response.status_code == status.HTTP_201_CREATED
-        data = response.json()
+        data = json_body(response)
         assert data["name"] == "test-workflow"
         assert data["description"] == "A test workflow"  # From parsed workflow
+        assert data["username"] == mock_user.username
         
         # Verify database interaction
-        mock_db_session.add.assert_called_once()
-        mock_db_session.commit.assert_called()
+        assert len(mock_db_session.added) == 1
+        assert mock_db_session.added[0].user_id == mock_user.id
+        assert mock_db_session.commits
         
-    def test_create_workflow_invalid_yaml(self, client):
+    @pytest.mark.asyncio
+    async def test_create_workflow_invalid_yaml(self, client):
         """Test creating workflow with invalid YAML"""
         workflow_data = {
             "yaml_content": "invalid: yaml: content:",
             "description": "Invalid workflow"
         }
         
-        response = client.post("/api/workflows", json=workflow_data)
+        response = await client.post("/api/workflows", json=workflow_data)
         assert response.status_code == status.HTTP_400_BAD_REQUEST
-        assert "Invalid workflow" in response.json()["detail"]
+        assert "Invalid workflow" in json_body(response)["detail"]
         
-    def test_get_workflow_success(self, client, mock_db_session, sample_workflow):
+    @pytest.mark.asyncio
+    async def test_get_workflow_success(self, client, mock_db_session, sample_workflow):
         """Test getting a specific workflow"""
         # Mock query to return workflow
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_workflow
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.result = FakeResult(one=sample_workflow)
         
-        response = client.get(f"/api/workflows/{sample_workflow.id}")
+        response = await client.get(f"/api/workflows/{sample_workflow.id}")
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = json_body(response)
         assert data["id"] == sample_workflow.id
         assert data["name"] == "test-workflow"
         
-    def test_get_workflow_not_found(self, client, mock_db_session):
+    @pytest.mark.asyncio
+    async def test_get_workflow_not_found(self, client, mock_db_session):
         """Test getting non-existent workflow"""
         workflow_id = str(uuid4())
-        response = client.get(f"/api/workflows/{workflow_id}")
+        response = await client.get(f"/api/workflows/{workflow_id}")
         assert response.status_code == status.HTTP_404_NOT_FOUND
         
-    def test_update_workflow_success(self, client, mock_db_session, sample_workflow, sample_workflow_yaml):
+    @pytest.mark.asyncio
+    async def test_update_workflow_success(
+        self, client, mock_db_session, sample_workflow, sample_workflow_yaml, patched_parse, patched_validate
+    ):
         """Test updating a workflow"""
-        # First mock: return workflow for ownership check
-        workflow_result = MagicMock()
-        workflow_result.scalar_one_or_none.return_value = sample_workflow
-        
-        # Second mock: return None for conflict check (no conflict)
-        conflict_result = MagicMock()
-        conflict_result.scalar_one_or_none.return_value = None
-        
-        mock_db_session.execute.side_effect = [workflow_result, conflict_result]
+        # Return workflow for ownership check, then None for conflict check
+        mock_db_session.queued = [FakeResult(one=sample_workflow), FakeResult(one=None)]
         
         # Update requires yaml_content
         updated_yaml = sample_workflow_yaml.replace("A test workflow", "Updated description")
@@ -239,130 +251,119 @@ class TestWorkflowRoutes:
         }
         
         # Mock parse_workflow_yaml for the update
-        with patch("seriesoftubes.api.workflow_routes.parse_workflow_yaml") as mock_parse:
-            mock_parsed = MagicMock()
-            mock_parsed.name = "test-workflow"
-            mock_parsed.version = "1.0.0"
-            mock_parsed.description = "Updated description"
-            mock_parse.return_value = mock_parsed
-            
-            with patch("seriesoftubes.api.workflow_routes.validate_dag") as mock_validate:
-                mock_validate.return_value = None
-                
-                response = client.put(f"/api/workflows/{sample_workflow.id}", json=update_data)
+        mock_parsed = MagicMock()
+        mock_parsed.name = "test-workflow"
+        mock_parsed.version = "1.0.0"
+        mock_parsed.description = "Updated description"
+        patched_parse.return_value = mock_parsed
+        
+        response = await client.put(f"/api/workflows/{sample_workflow.id}", json=update_data)
         
         assert response.status_code == status.HTTP_200_OK
         
         # Verify workflow was updated
         assert sample_workflow.description == "Updated description"
         assert sample_workflow.is_public is True
-        mock_db_session.commit.assert_called()
+        assert mock_db_session.commits
         
-    def test_update_workflow_not_owner(self, client, mock_db_session, sample_workflow, mock_user, sample_workflow_yaml):
+    @pytest.mark.asyncio
+    async def test_update_workflow_not_owner(self, client, mock_db_session, sample_workflow, mock_user, sample_workflow_yaml):
         """Test updating workflow when not the owner"""
         # Change workflow owner
         sample_workflow.user_id = "different-user-id"
         
         # Mock query to return None (workflow not found for this user)
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.result = FakeResult(one=None)
         
         update_data = {
             "yaml_content": sample_workflow_yaml,
             "is_public": True
         }
         
-        response = client.put(f"/api/workflows/{sample_workflow.id}", json=update_data)
+        response = await client.put(f"/api/workflows/{sample_workflow.id}", json=update_data)
         assert response.status_code == status.HTTP_404_NOT_FOUND
         
-    def test_delete_workflow_success(self, client, mock_db_session, sample_workflow):
+    @pytest.mark.asyncio
+    async def test_delete_workflow_success(self, client, mock_db_session, sample_workflow):
         """Test deleting a workflow"""
         # Mock query to return workflow
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_workflow
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.result = FakeResult(one=sample_workflow)
         
-        response = client.delete(f"/api/workflows/{sample_workflow.id}")
+        response = await client.delete(f"/api/workflows/{sample_workflow.id}")
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = json_body(response)
         assert "message" in data
         assert "deleted" in data["message"]
         
-        mock_db_session.delete.assert_called_once_with(sample_workflow)
-        mock_db_session.commit.assert_called()
+        assert mock_db_session.deleted == [sample_workflow]
+        assert mock_db_session.commits
         
-    def test_delete_workflow_not_owner(self, client, mock_db_session, sample_workflow):
+    @pytest.mark.asyncio
+    async def test_delete_workflow_not_owner(self, client, mock_db_session, sample_workflow):
         """Test deleting workflow when not the owner"""
         sample_workflow.user_id = "different-user-id"
         
         # Mock query to return None (workflow not found for this user)
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.result = FakeResult(one=None)
         
-        response = client.delete(f"/api/workflows/{sample_workflow.id}")
+        response = await client.delete(f"/api/workflows/{sample_workflow.id}")
         assert response.status_code == status.HTTP_404_NOT_FOUND
         
-    def test_validate_workflow_success(self, client, mock_db_session, sample_workflow):
+    @pytest.mark.asyncio
+    async def test_validate_workflow_success(
+        self, client, mock_db_session, sample_workflow, patched_parse, patched_validate
+    ):
         """Test validating a workflow"""
         # Mock getting workflow
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_workflow
-        mock_db_session.execute.return_value = mock_result
-        
-        with patch("seriesoftubes.api.workflow_routes.parse_workflow_yaml") as mock_parse:
-            mock_parsed = MagicMock()
-            mock_parsed.name = "test-workflow"
-            mock_parsed.version = "1.0.0"
-            mock_parsed.inputs = {}
-            mock_parsed.nodes = {}
-            mock_parsed.outputs = {}
-            mock_parsed.description = "Test workflow"
-            mock_parse.return_value = mock_parsed
-            
-            with patch("seriesoftubes.api.workflow_routes.validate_dag") as mock_validate_dag:
-                mock_validate_dag.return_value = None  # No errors
-                
-                response = client.post(
-                    f"/api/workflows/{sample_workflow.id}/validate",
-                    json={}  # Validate existing YAML
-                )
-            
+        mock_db_session.result = FakeResult(one=sample_workflow)
+        
+        mock_parsed = MagicMock()
+        mock_parsed.name = "test-workflow"
+        mock_parsed.version = "1.0.0"
+        mock_parsed.inputs = {}
+        mock_parsed.nodes = {}
+        mock_parsed.outputs = {}
+        mock_parsed.description = "Test workflow"
+        patched_parse.return_value = mock_parsed
+        
+        response = await client.post(
+            f"/api/workflows/{sample_workflow.id}/validate",
+            json={}  # Validate existing YAML
+        )
+        
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = json_body(response)
         assert data["valid"] is True
         assert "parsed_structure" in data
         assert data["parsed_structure"]["name"] == "test-workflow"
         
-    def test_validate_workflow_invalid(self, client, mock_db_session, sample_workflow):
+    @pytest.mark.asyncio
+    async def test_validate_workflow_invalid(
+        self, client, mock_db_session, sample_workflow, patched_parse
+    ):
         """Test validating invalid workflow"""
         # Mock getting workflow
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_workflow
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.result = FakeResult(one=sample_workflow)
         
-        with patch("seriesoftubes.api.workflow_routes.parse_workflow_yaml") as mock_parse:
-            mock_parse.side_effect = Exception("Invalid YAML")
-            
-            response = client.post(
-                f"/api/workflows/{sample_workflow.id}/validate",
-                json={"yaml_content": "invalid: yaml:"}
-            )
+        patched_parse.side_effect = Exception("Invalid YAML")
+        
+        response = await client.post(
+            f"/api/workflows/{sample_workflow.id}/validate",
+            json={"yaml_content": "invalid: yaml:"}
+        )
         
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = json_body(response)
         assert data["valid"] is False
         assert "errors" in data
         
-    def test_test_workflow_not_implemented(self, client, mock_db_session, sample_workflow):
+    @pytest.mark.asyncio
+    async def test_test_workflow_not_implemented(self, client, mock_db_session, sample_workflow):
         """Test dry-run workflow execution (not implemented)"""
         # Mock getting workflow
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_workflow
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.result = FakeResult(one=sample_workflow)
         
-        response = client.post(
+        response = await client.post(
             f"/api/workflows/{sample_workflow.id}/test",
             json={"inputs": {"message": "test"}}
         )
@@ -370,56 +371,57 @@ class TestWorkflowRoutes:
         # This endpoint is not yet implemented
         assert response.status_code == status.HTTP_501_NOT_IMPLEMENTED
         
-    def test_download_workflow(self, client, mock_db_session, sample_workflow):
+    @pytest.mark.asyncio
+    async def test_download_workflow(self, client, mock_db_session, sample_workflow):
         """Test downloading workflow as YAML"""
         # Mock getting workflow
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_workflow
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.result = FakeResult(one=sample_workflow)
         
-        response = client.get(f"/api/workflows/{sample_workflow.id}/download")
+        response = await client.get(f"/api/workflows/{sample_workflow.id}/download")
         assert response.status_code == status.HTTP_200_OK
         assert response.headers["content-type"] == "application/x-yaml"
         assert "attachment" in response.headers["content-disposition"]
         
-    def test_run_workflow_success(self, client, mock_db_session, sample_workflow):
+    @pytest.mark.asyncio
+    async def test_run_workflow_success(
+        self, client, mock_db_session, sample_workflow, patched_parse, monkeypatch
+    ):
         """Test running a workflow"""
         # Mock getting workflow
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_workflow
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.result = FakeResult(one=sample_workflow)
         
         # Mock the refresh to add an ID to the execution
         def mock_refresh(execution):
             execution.id = "execution-123"
             
-        mock_db_session.refresh.side_effect = mock_refresh
+        mock_db_session.on_refresh = mock_refresh
         
         # Mock parse_workflow_yaml
-        with patch("seriesoftubes.api.workflow_routes.parse_workflow_yaml") as mock_parse:
-            mock_parsed = MagicMock()
-            mock_parsed.outputs = {"result": "echo"}
-            mock_parse.return_value = mock_parsed
-            
-            # Mock the DatabaseProgressTrackingEngine (imported inline in the function)
-            with patch("seriesoftubes.api.execution.DatabaseProgressTrackingEngine") as mock_engine_class:
-                mock_engine = MagicMock()
-                mock_context = MagicMock()
-                mock_context.outputs = {"echo": {"result": "hello"}}
-                mock_context.errors = {}
-                mock_engine.execute = AsyncMock(return_value=mock_context)
-                mock_engine_class.return_value = mock_engine
-                
-                response = client.post(
-                    f"/api/workflows/{sample_workflow.id}/run",
-                    json={
-                        "inputs": {"message": "hello"},
-                        "sync": False
-                    }
-                )
-            
+        mock_parsed = MagicMock()
+        mock_parsed.outputs = {"result": "echo"}
+        patched_parse.return_value = mock_parsed
+        
+        # Mock the DatabaseProgressTrackingEngine used by the execution manager
+        mock_context = MagicMock()
+        mock_context.outputs = {"echo": {"result": "hello"}}
+        mock_context.errors = {}
+        mock_engine = MagicMock()
+        mock_engine.execute = AsyncMock(return_value=mock_context)
+        monkeypatch.setattr(
+            "seriesoftubes.api.execution.DatabaseProgressTrackingEngine",
+            MagicMock(return_value=mock_engine),
+        )
+        
+        response = await client.post(
+            f"/api/workflows/{sample_workflow.id}/run",
+            json={
+                "inputs": {"message": "hello"},
+                "sync": False
+            }
+        )
+        
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = json_body(response)
         assert "execution_id" in data
         assert data["status"] == "started"
         
@@ -1,11 +1,24 @@
 """Tests for caching functionality"""
 
+from types import SimpleNamespace
+
 import pytest
 
-from seriesoftubes.cache import MemoryCacheBackend, get_cache_backend
-from seriesoftubes.cache.keys import CacheKeyBuilder, hash_config, hash_dict
+from seriesoftubes.cache import (
+    GenerationalMemoryCacheBackend,
+    MemoryCacheBackend,
+    get_cache_backend,
+)
+from seriesoftubes.cache.keys import (
+    CacheKeyBuilder,
+    build_cache_key,
+    generate_cache_key,
+    hash_config,
+    hash_context,
+    hash_dict,
+)
 from seriesoftubes.cache.manager import CacheManager
-from seriesoftubes.models import LLMNodeConfig
+from seriesoftubes.models import HTTPNodeConfig, LLMNodeConfig
 
 
 class TestMemoryCacheBackend:
@@ -49,6 +62,38 @@ class TestMemoryCacheBackend:
         time.sleep(1.1)
         assert await cache.get("key1") is None
 
+    @pytest.mark.asyncio
+    async def test_writes_purge_expired_entries(self, monkeypatch):
+        """Test that writes drop expired entries before evicting live ones"""
+        clock = [1000.0]
+        # Only the cache module sees the fake clock, not the event loop
+        monkeypatch.setattr(
+            "seriesoftubes.cache.memory.time",
+            SimpleNamespace(monotonic=lambda: clock[0]),
+        )
+        cache = MemoryCacheBackend(max_size=2)
+
+        await cache.set("short", "value", ttl=1)
+        await cache.set("long", "value", ttl=60)
+        clock[0] += 2
+
+        # The expired entry is purged, so the live one survives the insert
+        await cache.set("new", "value")
+        assert cache.size() == 2
+        assert await cache.get("long") == "value"
+        assert await cache.get("new") == "value"
+
+    def test_expiry_heap_stays_bounded(self):
+        """Test that overwrites don't grow the expiry heap without bound"""
+        cache = MemoryCacheBackend(max_size=10)
+
+        for i in range(10_000):
+            cache.set_sync(f"key{i % 5}", i, ttl=3600)
+
+        assert cache.size() == 5
+        assert len(cache._expiry_heap) <= 2 * cache.size()
+        assert cache.get_sync("key4") == 9999
+
     @pytest.mark.asyncio
     async def test_max_size_eviction(self):
         """Test max size eviction"""
@@ -65,6 +110,73 @@ class TestMemoryCacheBackend:
         assert await cache.get("key2") == "value2"
         assert await cache.get("key3") == "value3"
 
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test that reads and overwrites refresh an entry's recency"""
+        cache = MemoryCacheBackend(max_size=2)
+
+        await cache.set("key1", "value1")
+        await cache.set("key2", "value2")
+
+        # Reading key1 makes key2 the least recently used
+        assert await cache.get("key1") == "value1"
+        await cache.set("key3", "value3")
+        assert await cache.get("key2") is None
+        assert await cache.get("key1") == "value1"
+
+        # Overwriting key3 makes key1 the least recently used
+        await cache.set("key3", "updated")
+        await cache.set("key4", "value4")
+        assert await cache.get("key1") is None
+        assert await cache.get("key3") == "updated"
+
+    @pytest.mark.asyncio
+    async def test_tinylfu_keeps_hot_entries_through_scan(self):
+        """Test that TinyLFU admission protects frequently read entries"""
+        cache = MemoryCacheBackend(max_size=2, policy="tinylfu")
+
+        await cache.set("hot", "value")
+        for _ in range(5):
+            assert await cache.get("hot") == "value"
+        await cache.set("warm", "value")
+
+        # A scan of one-off keys should not push out the hot entry
+        for i in range(10):
+            await cache.set(f"scan-{i}", i)
+
+        assert await cache.get("hot") == "value"
+        assert cache.size() == 2
+
+    @pytest.mark.asyncio
+    async def test_max_bytes_eviction(self):
+        """Test that a byte budget evicts least recently used values"""
+        cache = MemoryCacheBackend(max_size=100, max_bytes=100)
+
+        await cache.set("small", "x")
+        await cache.set("large1", "y" * 40)
+        await cache.set("large2", "z" * 40)
+        assert cache.bytes_used() == 3 + 42 + 42
+
+        # Reading "small" keeps it; "large1" is now least recently used
+        assert await cache.get("small") == "x"
+        await cache.set("large3", "w" * 40)
+        assert await cache.get("large1") is None
+        assert await cache.get("small") == "x"
+        assert cache.bytes_used() == 3 + 42 + 42
+
+        # Values bigger than the whole budget are not cached
+        await cache.set("huge", "h" * 200)
+        assert await cache.get("huge") is None
+        assert cache.size() == 3
+
+        await cache.delete("small")
+        assert cache.bytes_used() == 42 + 42
+
+    def test_unknown_policy(self):
+        """Test rejecting unknown eviction policies"""
+        with pytest.raises(ValueError, match="Unsupported eviction policy"):
+            MemoryCacheBackend(policy="fifo")
+
     @pytest.mark.asyncio
     async def test_clear(self):
         """Test cache clear"""
@@ -80,6 +192,73 @@ class TestMemoryCacheBackend:
         assert await cache.get("key2") is None
 
 
+class TestGenerationalMemoryCacheBackend:
+    """Test generational memory cache backend"""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Fake monotonic clock seen only by the cache module"""
+        now = [1000.0]
+        monkeypatch.setattr(
+            "seriesoftubes.cache.memory.time", SimpleNamespace(monotonic=lambda: now[0])
+        )
+        return now
+
+    @pytest.mark.asyncio
+    async def test_basic_operations(self, clock):
+        """Test basic cache operations"""
+        cache = GenerationalMemoryCacheBackend(ttl=10)
+
+        await cache.set("key1", "value1")
+        assert await cache.get("key1") == "value1"
+        assert await cache.exists("key1") is True
+        assert await cache.delete("key1") is True
+        assert await cache.delete("key1") is False
+        assert await cache.get("key1") is None
+
+    @pytest.mark.asyncio
+    async def test_generations_expire(self, clock):
+        """Test entries survive one rotation and expire on the next"""
+        cache = GenerationalMemoryCacheBackend(ttl=10)
+
+        await cache.set("key1", "value1")
+        clock[0] += 6
+        await cache.set("key2", "value2")
+        assert cache.size() == 2
+
+        # key1 was never read again, so it expires with its generation
+        clock[0] += 6
+        assert await cache.get("key1") is None
+        assert await cache.get("key2") == "value2"
+
+        # Reading key2 moved it into the current generation, but not past
+        # the deadline it was written with
+        clock[0] += 6
+        assert await cache.get("key2") is None
+        assert cache.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_set_honors_ttl(self, clock):
+        """Test entries expire after the ttl passed to set"""
+        cache = GenerationalMemoryCacheBackend(ttl=10)
+
+        await cache.set("short", "value", ttl=2)
+        await cache.set("default", "value")
+        clock[0] += 3
+        assert await cache.get("short") is None
+        assert await cache.get("default") == "value"
+
+        # A longer ttl is still cut short by the generations if never read
+        await cache.set("long", "value", ttl=60)
+        clock[0] += 11
+        assert await cache.get("long") is None
+
+    def test_invalid_ttl(self):
+        """Test rejecting non-positive TTLs"""
+        with pytest.raises(ValueError, match="ttl must be positive"):
+            GenerationalMemoryCacheBackend(ttl=0)
+
+
 class TestCacheKeys:
     """Test cache key generation"""
 
@@ -97,6 +276,23 @@ class TestCacheKeys:
         assert hash1 == hash2
         # Different content should produce different hash
         assert hash1 != hash3
+        # Values that only differ in type should not collide
+        assert hash_dict({"a": "1"}) != hash_dict({"a": 1})
+
+    def test_hash_dict_large_integers(self):
+        """Test integers outside the 64-bit range still hash"""
+        assert hash_dict({"a": 2**70}) == hash_dict({"a": 2**70})
+        assert hash_dict({"a": 2**70}) != hash_dict({"a": 2**70 + 1})
+
+    def test_hash_dict_secure(self):
+        """Test opting into the cryptographic hash"""
+        data = {"a": 1, "b": 2}
+
+        secure_hash = hash_dict(data, secure=True)
+
+        assert secure_hash == hash_dict({"b": 2, "a": 1}, secure=True)
+        assert len(secure_hash) == 64  # SHA-256 hex digest
+        assert secure_hash != hash_dict(data)
 
     def test_hash_config(self):
         """Test config hashing"""
@@ -113,6 +309,31 @@ class TestCacheKeys:
         # Different config should produce different hash
         assert hash1 != hash3
 
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+    def test_hash_dict_keeps_non_finite_floats_apart_from_none(self, value):
+        """Test NaN and infinities don't hash like None"""
+        assert hash_dict({"a": value}) != hash_dict({"a": None})
+        assert hash_dict({"a": [value]}) != hash_dict({"a": [None]})
+
+    def test_hash_config_sees_nested_mutation(self):
+        """Test in-place changes to nested values change the config hash"""
+        config = LLMNodeConfig(prompt="hi", context={"a": "x"})
+        original = hash_config(config)
+
+        config.context["b"] = "y"
+        assert hash_config(config) != original
+
+    def test_hash_config_tells_bools_from_ints(self):
+        """Test a value changing from 1 to True changes the config hash"""
+        config = HTTPNodeConfig(url="http://example.com", body={"a": 1})
+        original = hash_config(config)
+
+        config.body["a"] = True
+        assert hash_config(config) != original
+        assert hash_config(config) == hash_config(
+            HTTPNodeConfig(url="http://example.com", body={"a": True})
+        )
+
     def test_cache_key_builder(self):
         """Test cache key builder"""
         config = LLMNodeConfig(prompt="test prompt", model="gpt-4o")
@@ -147,6 +368,45 @@ class TestCacheKeys:
         )
         assert key != key3
 
+    def test_cache_key_builder_matches_generate_cache_key(self):
+        """Test builder keys keep the generate_cache_key layout"""
+        config = LLMNodeConfig(prompt="test prompt")
+        context_data = {"inputs": {"test": "data"}}
+
+        for prefix in (None, "s10s"):
+            builder = CacheKeyBuilder("llm", "test_node").with_config(config)
+            if prefix:
+                builder.with_prefix(prefix)
+            key = builder.with_context(context_data).build()
+
+            assert key == generate_cache_key(
+                "llm",
+                "test_node",
+                hash_config(config),
+                hash_dict(context_data),
+                prefix,
+            )
+
+    def test_build_cache_key_matches_builder(self):
+        """Test the one-call helper builds the same key as the builder"""
+        config = LLMNodeConfig(prompt="test prompt")
+        context_data = {"inputs": {"test": "data"}, "timestamp": "2023-01-01"}
+
+        expected = (
+            CacheKeyBuilder("llm", "test_node")
+            .with_prefix("s10s")
+            .with_config(config)
+            .with_context(context_data, exclude_keys=["timestamp"])
+            .build()
+        )
+
+        assert (
+            build_cache_key(
+                "llm", "test_node", config, context_data, ["timestamp"], prefix="s10s"
+            )
+            == expected
+        )
+
     def test_exclude_context_keys(self):
         """Test excluding context keys from hash"""
         context_data = {
@@ -186,6 +446,14 @@ class TestCacheKeys:
         # With exclusions, keys should be the same
         assert key2 == key3
 
+    def test_exclude_absent_context_keys(self):
+        """Test exclude keys missing from the context leave the hash unchanged"""
+        context_data = {"inputs": {"test": "data"}, "outputs": {}}
+
+        assert hash_context(
+            context_data, exclude_keys=["timestamp", "execution_id"]
+        ) == hash_context(context_data)
+
 
 class TestCacheManager:
     """Test cache manager"""
@@ -229,6 +497,29 @@ class TestCacheManager:
 
         assert cached_different is None
 
+    @pytest.mark.asyncio
+    async def test_cache_manager_memory_fast_path(self, monkeypatch):
+        """Test the manager uses the memory backend's synchronous methods"""
+        backend = MemoryCacheBackend()
+        manager = CacheManager(backend, default_ttl=3600)
+
+        async def fail(*args, **kwargs):
+            msg = "async backend method should be skipped"
+            raise AssertionError(msg)
+
+        monkeypatch.setattr(backend, "get", fail)
+        monkeypatch.setattr(backend, "set", fail)
+
+        config = LLMNodeConfig(prompt="test prompt")
+        context_data = {"inputs": {"test": "data"}}
+        await manager.cache_result(
+            "llm", "test_node", config, context_data, {"ok": True}
+        )
+
+        assert await manager.get_cached_result(
+            "llm", "test_node", config, context_data
+        ) == {"ok": True}
+
 
 class TestCacheFactory:
     """Test cache factory"""
@@ -238,6 +529,11 @@ class TestCacheFactory:
         backend = get_cache_backend("memory", max_size=100)
         assert isinstance(backend, MemoryCacheBackend)
 
+    def test_get_generational_memory_backend(self):
+        """Test getting generational memory backend"""
+        backend = get_cache_backend("memory-gen", ttl=300, key_prefix="ignored:")
+        assert isinstance(backend, GenerationalMemoryCacheBackend)
+
     def test_unsupported_backend(self):
         """Test unsupported backend"""
         with pytest.raises(ValueError, match="Unsupported cache backend"):
@@ -299,3 +299,46 @@ async def test_engine_with_test_redis_cache():
         assert mock_provider.call.call_count == 0
 
     await engine.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not FAKEREDIS_AVAILABLE, reason="fakeredis not available")
+async def test_test_redis_cache_clear_in_batches(monkeypatch):
+    """Test clearing more keys than fit in one delete batch"""
+    monkeypatch.setattr("seriesoftubes.cache.redis.CLEAR_BATCH_SIZE", 3)
+    cache_backend = FakeRedisCacheBackend()
+    client = await cache_backend._get_client()
+    await client.set("other:key", "kept")
+
+    for i in range(10):
+        await cache_backend.set(f"key{i}", i)
+
+    await cache_backend.clear()
+
+    for i in range(10):
+        assert await cache_backend.get(f"key{i}") is None
+    assert await client.get("other:key") == "kept"
+
+    await cache_backend.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not FAKEREDIS_AVAILABLE, reason="fakeredis not available")
+async def test_test_redis_cache_round_trips_json_values():
+    """Test values come back from Redis as their JSON equivalents"""
+    cache_backend = FakeRedisCacheBackend()
+    value = {
+        "response": "text " * 500,
+        "structured_output": {"items": [1, 2.5, None, True], "nested": {"a": "b"}},
+        1: ("tuple", "values"),
+    }
+
+    await cache_backend.set("llm", value)
+
+    assert await cache_backend.get("llm") == {
+        "response": "text " * 500,
+        "structured_output": {"items": [1, 2.5, None, True], "nested": {"a": "b"}},
+        "1": ["tuple", "values"],
+    }
+
+    await cache_backend.close()
@@ -1,59 +1,68 @@
 """Tests for CLI commands"""
 
+import contextlib
+import io
 from unittest.mock import patch
 
 import pytest
-from typer import BadParameter
-from typer.testing import CliRunner
+from click.testing import CliRunner
+from typer import BadParameter, Exit
 
-from seriesoftubes.cli import app
-from seriesoftubes.cli.main import parse_input_args
+from seriesoftubes.cli import main as cli_main
+from seriesoftubes.cli.main import list_workflows, parse_input_args, validate
 
 
 class TestParseInputArgs:
     """Test input argument parsing"""
 
-    def test_empty_inputs(self):
-        """Test parsing empty inputs"""
-        assert parse_input_args(None) == {}
-        assert parse_input_args([]) == {}
-
-    def test_string_values(self):
-        """Test parsing string values"""
-        inputs = parse_input_args(["name=John", "message=Hello world"])
-        assert inputs == {"name": "John", "message": "Hello world"}
-
-    def test_numeric_values(self):
-        """Test parsing numeric values"""
-        inputs = parse_input_args(["count=42", "price=19.99"])
-        assert inputs == {"count": 42, "price": 19.99}
-
-    def test_boolean_values(self):
-        """Test parsing boolean values"""
-        inputs = parse_input_args(["enabled=true", "disabled=false"])
-        assert inputs == {"enabled": True, "disabled": False}
-
-    def test_json_values(self):
-        """Test parsing JSON values"""
-        inputs = parse_input_args(
-            ['data={"name": "John", "age": 30}', 'tags=["python", "cli"]']
-        )
-        assert inputs == {
-            "data": {"name": "John", "age": 30},
-            "tags": ["python", "cli"],
-        }
-
-    def test_mixed_values(self):
-        """Test parsing mixed value types"""
-        inputs = parse_input_args(
-            ["text=hello", "count=5", "active=true", 'data={"key": "value"}']
-        )
-        assert inputs == {
-            "text": "hello",
-            "count": 5,
-            "active": True,
-            "data": {"key": "value"},
-        }
+    @pytest.mark.parametrize(
+        ("args", "expected"),
+        [
+            pytest.param(None, {}, id="none"),
+            pytest.param([], {}, id="empty"),
+            pytest.param(
+                ["name=John", "message=Hello world"],
+                {"name": "John", "message": "Hello world"},
+                id="strings",
+            ),
+            pytest.param(
+                ["count=42", "price=19.99"],
+                {"count": 42, "price": 19.99},
+                id="numbers",
+            ),
+            pytest.param(
+                ["enabled=true", "disabled=false"],
+                {"enabled": True, "disabled": False},
+                id="booleans",
+            ),
+            pytest.param(
+                [
+                    'data={"name": "John", "age": 30}',
+                    'tags=["python", "cli"]',
+                    "list=[1, 2, 3]",
+                ],
+                {
+                    "data": {"name": "John", "age": 30},
+                    "tags": ["python", "cli"],
+                    "list": [1, 2, 3],
+                },
+                id="json",
+            ),
+            pytest.param(
+                ["text=hello", "count=5", "active=true", 'data={"key": "value"}'],
+                {
+                    "text": "hello",
+                    "count": 5,
+                    "active": True,
+                    "data": {"key": "value"},
+                },
+                id="mixed",
+            ),
+        ],
+    )
+    def test_parse_input_args(self, args, expected):
+        """Test parsing input values of each supported type"""
+        assert parse_input_args(args) == expected
 
     def test_invalid_format(self):
         """Test invalid input format"""
@@ -64,6 +73,111 @@ class TestParseInputArgs:
 runner = CliRunner()
 
 
+@pytest.fixture(scope="module")
+def list_workflow_tree(tmp_path_factory):
+    """Directory of workflows for the list command tests, built once per module"""
+    tree = tmp_path_factory.mktemp("workflows")
+    (tree / "workflow1.yaml").write_text(
+        """
+name: workflow_one
+version: "1.0.0"
+description: Test workflow 1
+nodes:
+  node1:
+    type: conditional
+    config:
+      conditions:
+        - is_default: true
+          then: "node1"
+"""
+    )
+
+    (tree / "subdir").mkdir()
+    (tree / "subdir" / "workflow2.yml").write_text(
+        """
+name: workflow_two
+version: "2.0"
+nodes:
+  node1:
+    type: conditional
+    config:
+      conditions:
+        - is_default: true
+          then: "node1"
+  node2:
+    type: conditional
+    config:
+      conditions:
+        - is_default: true
+          then: "node2"
+"""
+    )
+
+    (tree / "test").mkdir()
+    (tree / "test" / "test_workflow.yaml").write_text(
+        """
+name: test_workflow
+nodes:
+  node1:
+    type: conditional
+    config:
+      conditions:
+        - is_default: true
+          then: "node1"
+"""
+    )
+
+    # Also create a non-workflow YAML (empty workflow with no nodes)
+    (tree / "not-workflow.yaml").write_text("name: empty\nversion: '1.0'")
+    return tree
+
+
+def invoke_direct(command, **kwargs) -> tuple[int, str]:
+    """Call a CLI command function in-process and capture its output
+
+    Skips Click's argument parsing, so only use it for tests that don't
+    exercise option handling. Returns (exit code, stdout).
+    """
+    stdout = io.StringIO()
+    exit_code = 0
+    with contextlib.redirect_stdout(stdout):
+        try:
+            command(**kwargs)
+        except Exit as e:
+            exit_code = e.exit_code
+    return exit_code, stdout.getvalue()
+
+
+@pytest.fixture(scope="module")
+def test_workflow_file(tmp_path_factory):
+    """Workflow shared by the test command tests, written once per module"""
+    workflow_file = tmp_path_factory.mktemp("wf") / "test.yaml"
+    workflow_file.write_text(
+        """
+name: test_workflow
+version: "1.0.0"
+inputs:
+  text:
+    type: string
+    required: true
+  count:
+    type: number
+    required: false
+    default: 5
+nodes:
+  echo:
+    type: conditional
+    config:
+      conditions:
+        - is_default: true
+          then: "echo"
+outputs:
+  result: process
+"""
+    )
+    return workflow_file
+
+
 class TestCLI:
     """Test CLI commands"""
 
@@ -94,24 +208,28 @@ outputs:
 """
         )
 
-        result = runner.invoke(app, ["validate", str(workflow_file), "--local"])
-        assert result.exit_code == 0
-        assert "✓ Parsed workflow: test_workflow" in result.stdout
-        assert "✓ No cycles detected" in result.stdout
-        assert "✓ All dependencies exist" in result.stdout
-        assert "✓ Workflow is valid!" in result.stdout
+        exit_code, stdout = invoke_direct(
+            validate, workflow=str(workflow_file), local=True
+        )
+        assert exit_code == 0
+        assert "✓ Parsed workflow: test_workflow" in stdout
+        assert "✓ No cycles detected" in stdout
+        assert "✓ All dependencies exist" in stdout
+        assert "✓ Workflow is valid!" in stdout
 
     def test_validate_invalid_workflow(self, tmp_path):
         """Test validate command with invalid workflow"""
         workflow_file = tmp_path / "invalid.yaml"
         workflow_file.write_text("invalid: yaml: content:")
 
-        result = runner.invoke(app, ["validate", str(workflow_file), "--local"])
-        assert result.exit_code == 1
-        assert "✗ Validation failed:" in result.stdout
+        exit_code, stdout = invoke_direct(
+            validate, workflow=str(workflow_file), local=True
+        )
+        assert exit_code == 1
+        assert "✗ Validation failed:" in stdout
 
     @patch("seriesoftubes.cli.main.run_workflow")
-    def test_run_command(self, mock_run_workflow, tmp_path):
+    def test_run_command(self, mock_run_workflow, tmp_path, cli):
         """Test run command"""
         # Create a simple workflow file
         workflow_file = tmp_path / "test.yaml"
@@ -146,14 +264,17 @@ outputs:
         }
 
         result = runner.invoke(
-            app, ["run", str(workflow_file), "-i", "text=Hello", "--no-save", "--local"]
+            cli, ["run", str(workflow_file), "-i", "text=Hello", "--no-save", "--local"]
         )
         assert result.exit_code == 0
         assert "✓ Loaded workflow: test_workflow v1.0" in result.stdout
         assert "✓ Parsed inputs: ['text']" in result.stdout
         assert "✓ Workflow completed successfully!" in result.stdout
         # The CLI now displays outputs differently
-        assert mock_run_workflow.called
+        mock_run_workflow.assert_called_once()
+        args, kwargs = mock_run_workflow.call_args
+        assert args[1] == {"text": "Hello"}
+        assert kwargs["save_outputs"] is False
 
     @patch("seriesoftubes.cli.main.run_workflow")
     def test_run_command_with_error(self, mock_run_workflow, tmp_path):
@@ -182,148 +303,54 @@ nodes:
             "errors": {"fail": "Test error"},
         }
 
-        result = runner.invoke(app, ["run", str(workflow_file), "--no-save", "--local"])
-        assert result.exit_code == 1
-        assert "✗ Workflow failed!" in result.stdout
-        assert "fail: Test error" in result.stdout
+        exit_code, stdout = invoke_direct(
+            cli_main.run, workflow=str(workflow_file), no_save=True, local=True
+        )
+        assert exit_code == 1
+        assert "✗ Workflow failed!" in stdout
+        assert "fail: Test error" in stdout
+        mock_run_workflow.assert_called_once()
 
-    def test_run_missing_file(self):
+    def test_run_missing_file(self, cli):
         """Test run command with missing file"""
-        result = runner.invoke(app, ["run", "nonexistent.yaml", "--local"])
+        result = runner.invoke(cli, ["run", "nonexistent.yaml", "--local"])
         assert result.exit_code == 1
         assert "✗" in result.stdout
 
-    def test_list_command(self, tmp_path):
+    def test_list_command(self, list_workflow_tree, cli):
         """Test list command"""
-        # Create test workflow files
-        workflow1 = tmp_path / "workflow1.yaml"
-        workflow1.write_text(
-            """
-name: workflow_one
-version: "1.0.0"
-description: Test workflow 1
-nodes:
-  node1:
-    type: conditional
-    config:
-      conditions:
-        - is_default: true
-          then: "node1"
-"""
-        )
-
-        workflow2 = tmp_path / "subdir" / "workflow2.yml"
-        workflow2.parent.mkdir()
-        workflow2.write_text(
-            """
-name: workflow_two
-version: "2.0"
-nodes:
-  node1:
-    type: conditional
-    config:
-      conditions:
-        - is_default: true
-          then: "node1"
-  node2:
-    type: conditional
-    config:
-      conditions:
-        - is_default: true
-          then: "node2"
-"""
-        )
-
-        # Also create a non-workflow YAML (empty workflow with no nodes)
-        (tmp_path / "not-workflow.yaml").write_text("name: empty\nversion: '1.0'")
-
-        result = runner.invoke(app, ["list", "-d", str(tmp_path), "--local"])
+        result = runner.invoke(cli, ["list", "-d", str(list_workflow_tree), "--local"])
         assert result.exit_code == 0
-        assert "Found 2 workflow(s)" in result.stdout
+        assert "Found 3 workflow(s)" in result.stdout
         assert "workflow_one" in result.stdout
         assert "workflow_two" in result.stdout
+        assert "test_workflow" in result.stdout
         assert "1.0" in result.stdout
         assert "2.0" in result.stdout
         assert "Test workflow 1" in result.stdout
 
     def test_list_command_no_workflows(self, tmp_path):
         """Test list command with no workflows"""
-        result = runner.invoke(app, ["list", "-d", str(tmp_path), "--local"])
-        assert result.exit_code == 0
-        assert "No YAML files found" in result.stdout
-
-    def test_list_command_with_exclude(self, tmp_path):
-        """Test list command with exclude patterns"""
-        # Create workflows in different directories
-        (tmp_path / "workflow.yaml").write_text(
-            """
-name: main_workflow
-nodes:
-  node1:
-    type: conditional
-    config:
-      conditions:
-        - is_default: true
-          then: "node1"
-"""
-        )
-
-        test_dir = tmp_path / "test"
-        test_dir.mkdir()
-        (test_dir / "test_workflow.yaml").write_text(
-            """
-name: test_workflow
-nodes:
-  node1:
-    type: conditional
-    config:
-      conditions:
-        - is_default: true
-          then: "node1"
-"""
+        exit_code, stdout = invoke_direct(
+            list_workflows, directory=tmp_path, local=True
         )
+        assert exit_code == 0
+        assert "No YAML files found" in stdout
 
-        # List without exclude
-        result = runner.invoke(app, ["list", "-d", str(tmp_path), "--local"])
-        assert "Found 2 workflow(s)" in result.stdout
-
-        # List with exclude
+    def test_list_command_with_exclude(self, list_workflow_tree, cli):
+        """Test list command with exclude patterns"""
         result = runner.invoke(
-            app, ["list", "-d", str(tmp_path), "-e", "test/*", "--local"]
+            cli, ["list", "-d", str(list_workflow_tree), "-e", "test/*", "--local"]
         )
-        assert "Found 1 workflow(s)" in result.stdout
-        assert "main_workflow" in result.stdout
+        assert "Found 2 workflow(s)" in result.stdout
+        assert "workflow_one" in result.stdout
         assert "test_workflow" not in result.stdout
 
-    def test_test_command_dry_run(self, tmp_path):
+    def test_test_command_dry_run(self, test_workflow_file, cli):
         """Test test command in dry-run mode"""
-        workflow_file = tmp_path / "test.yaml"
-        workflow_file.write_text(
-            """
-name: test_workflow
-version: "1.0.0"
-inputs:
-  text:
-    type: string
-    required: true
-  count:
-    type: number
-    required: false
-    default: 5
-nodes:
-  echo:
-    type: conditional
-    config:
-      conditions:
-        - is_default: true
-          then: "echo"
-outputs:
-  result: process
-"""
-        )
-
         result = runner.invoke(
-            app, ["test", str(workflow_file), "--dry-run", "-i", "text=hello", "-v"]
+            cli,
+            ["test", str(test_workflow_file), "--dry-run", "-i", "text=hello", "-v"],
         )
         assert result.exit_code == 0
         assert "✓ Loaded workflow: test_workflow v1.0" in result.stdout
@@ -336,28 +363,8 @@ outputs:
         assert "✓ Workflow validation passed!" in result.stdout
 
     @patch("seriesoftubes.cli.main.run_workflow")
-    def test_test_command_execute(self, mock_run_workflow, tmp_path):
+    def test_test_command_execute(self, mock_run_workflow, test_workflow_file):
         """Test test command with execution"""
-        workflow_file = tmp_path / "test.yaml"
-        workflow_file.write_text(
-            """
-name: test_workflow
-inputs:
-  text:
-    type: string
-    required: true
-nodes:
-  echo:
-    type: conditional
-    config:
-      conditions:
-        - is_default: true
-          then: "echo"
-outputs:
-  result: process
-"""
-        )
-
         # Mock successful execution
         mock_run_workflow.return_value = {
             "execution_id": "test-id",
@@ -368,31 +375,18 @@ outputs:
             "errors": {},
         }
 
-        result = runner.invoke(app, ["test", str(workflow_file), "-i", "text=hello"])
-        assert result.exit_code == 0
-        assert "✓ Test passed!" in result.stdout
-        assert "result: test output" in result.stdout
-
-    def test_test_command_missing_inputs(self, tmp_path):
-        """Test test command with missing required inputs"""
-        workflow_file = tmp_path / "test.yaml"
-        workflow_file.write_text(
-            """
-name: test_workflow
-inputs:
-  required_input:
-    type: string
-    required: true
-nodes:
-  echo:
-    type: conditional
-    config:
-      conditions:
-        - is_default: true
-          then: "echo"
-"""
+        exit_code, stdout = invoke_direct(
+            cli_main.test, workflow=test_workflow_file, inputs=["text=hello"]
         )
-
-        result = runner.invoke(app, ["test", str(workflow_file), "--dry-run"])
+        assert exit_code == 0
+        assert "✓ Test passed!" in stdout
+        assert "result: test output" in stdout
+        mock_run_workflow.assert_called_once()
+        # Optional inputs are filled in from their defaults
+        assert mock_run_workflow.call_args.args[1] == {"text": "hello", "count": 5}
+
+    def test_test_command_missing_inputs(self, test_workflow_file, cli):
+        """Test test command with missing required inputs"""
+        result = runner.invoke(cli, ["test", str(test_workflow_file), "--dry-run"])
         assert result.exit_code == 0
-        assert "⚠ Missing required inputs: required_input" in result.stdout
+        assert "⚠ Missing required inputs: text" in result.stdout
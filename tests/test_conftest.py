@@ -11,16 +11,12 @@ from unittest.mock import patch, MagicMock, AsyncMock
 
 @pytest.fixture
 def mock_redis():
-    """Mock Redis for tests that don't need actual Redis"""
-    with patch('seriesoftubes.cache.redis.RedisCacheBackend') as mock:
-        instance = AsyncMock()
-        instance.get = AsyncMock(return_value=None)
-        instance.set = AsyncMock(return_value=True)
-        instance.exists = AsyncMock(return_value=False)
-        instance.delete = AsyncMock(return_value=True)
-        instance.clear = AsyncMock(return_value=True)
-        instance.close = AsyncMock()
-        mock.return_value = instance
+    """In-process fakeredis cache for tests that don't need actual Redis"""
+    pytest.importorskip("fakeredis")
+    from seriesoftubes.cache.test_redis import FakeRedisCacheBackend
+
+    instance = FakeRedisCacheBackend()
+    with patch('seriesoftubes.cache.redis.RedisCacheBackend', return_value=instance):
         yield instance
 
 
@@ -1,8 +1,8 @@
 """Tests for data flow primitives: split, filter, transform, aggregate"""
 
 import pytest
+import pytest_asyncio
 
-from seriesoftubes.engine import WorkflowEngine
 from seriesoftubes.models import (
     FilterNodeConfig,
     Node,
@@ -13,10 +13,13 @@ from seriesoftubes.models import (
     WorkflowInput,
 )
 
+# One event loop for the module, so the shared engine's resources stay on it
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def sample_companies():
-    """Sample company data for testing"""
+    """Sample company data for testing (shared; tests must not mutate it)"""
     return [
         {
             "name": "Acme Corp",
@@ -51,16 +54,72 @@ def sample_companies():
     ]
 
 
-@pytest.fixture
-def engine():
-    """Workflow engine instance"""
-    return WorkflowEngine()
+# Shared by every split -> filter pipeline below; the executors never mutate nodes
+SPLIT_COMPANIES = Node(
+    name="split_companies",
+    type=NodeType.SPLIT,
+    config=SplitNodeConfig(field="inputs.companies", item_name="company"),
+)
+HIGH_VALUE_CONDITION = "{{ company.revenue > 1000000 }}"
+# Acme (2M), Gamma (5M) and Epsilon (1.2M): also exactly the Technology companies
+HIGH_VALUE_NAMES = frozenset({"Acme Corp", "Gamma Tech", "Epsilon Inc"})
+
+
+def split_filter_workflow(
+    name: str,
+    condition: str = HIGH_VALUE_CONDITION,
+    filter_name: str = "filter_high_value",
+    extra_nodes: dict[str, Node] | None = None,
+    outputs: dict[str, str] | None = None,
+) -> Workflow:
+    """Workflow that splits the input companies and filters them on condition"""
+    filter_node = Node(
+        name=filter_name,
+        type=NodeType.FILTER,
+        depends_on=["split_companies"],
+        config=FilterNodeConfig(condition=condition),
+    )
+    return Workflow(
+        name=name,
+        version="1.0.0",
+        inputs={"companies": WorkflowInput(input_type="array", required=True)},
+        nodes={
+            "split_companies": SPLIT_COMPANIES,
+            filter_name: filter_node,
+            **(extra_nodes or {}),
+        },
+        outputs=outputs or {"filtered_result": filter_name},
+    )
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def transformed_pipeline_result(engine, sample_companies):
+    """Split -> filter -> transform run, executed once and shared by its checks"""
+    workflow = split_filter_workflow(
+        "test-transform",
+        extra_nodes={
+            "transform_companies": Node(
+                name="transform_companies",
+                type=NodeType.TRANSFORM,
+                depends_on=["filter_high_value"],
+                config=TransformNodeConfig(
+                    template={
+                        "company_id": "{{ item.name | replace(' ', '_') | lower }}",
+                        "display_name": "{{ item.name }}",
+                        "revenue_millions": "{{ (item.revenue / 1000000) | round(2) }}",
+                        "size_category": "{% if item.employees > 75 %}large{% elif item.employees > 40 %}medium{% else %}small{% endif %}",
+                    }
+                ),
+            ),
+        },
+        outputs={"transformed_result": "transform_companies"},
+    )
+    return await engine.execute(workflow, {"companies": sample_companies})
 
 
 class TestSplitNode:
     """Test split node functionality"""
 
-    @pytest.mark.asyncio
     async def test_split_basic_functionality(self, engine, sample_companies):
         """Test basic split node operation"""
         # Create a simple workflow with just a split node
@@ -95,7 +154,6 @@ class TestSplitNode:
         assert len(split_output["split_items"]) == 5
         assert split_output["split_items"] == sample_companies
 
-    @pytest.mark.asyncio
     async def test_split_invalid_field(self, engine, sample_companies):
         """Test split node with invalid field reference"""
         workflow = Workflow(
@@ -125,35 +183,16 @@ class TestSplitNode:
 class TestFilterNode:
     """Test filter node functionality"""
 
-    @pytest.mark.asyncio
-    async def test_filter_with_split(self, engine, sample_companies):
+    @pytest.mark.parametrize(
+        "condition",
+        [
+            pytest.param(HIGH_VALUE_CONDITION, id="revenue"),
+            pytest.param("{{ company.industry == 'Technology' }}", id="industry"),
+        ],
+    )
+    async def test_filter_with_split(self, engine, sample_companies, condition):
         """Test filter node working with split node"""
-        workflow = Workflow(
-            name="test-split-filter",
-            version="1.0.0",
-            inputs={"companies": WorkflowInput(input_type="array", required=True)},
-            nodes={
-                "split_companies": Node(
-                    name="split_companies",
-                    type=NodeType.SPLIT,
-                    config=SplitNodeConfig(
-                        field="inputs.companies", item_name="company"
-                    ),
-                ),
-                "filter_high_value": Node(
-                    name="filter_high_value",
-                    type=NodeType.FILTER,
-                    depends_on=["split_companies"],
-                    config=FilterNodeConfig(
-                        condition="{{ company.revenue > 1000000 }}"
-                    ),
-                ),
-            },
-            outputs={
-                "split_result": "split_companies",
-                "filtered_result": "filter_high_value",
-            },
-        )
+        workflow = split_filter_workflow("test-split-filter", condition)
 
         # Execute workflow
         context = await engine.execute(workflow, {"companies": sample_companies})
@@ -166,102 +205,18 @@ class TestFilterNode:
         assert isinstance(filtered_output, list)
         assert len(filtered_output) == 5  # Should have 5 results (some None)
 
-        # Count non-None results (companies with revenue > 1M)
+        # Both conditions keep the same three companies
         filtered_companies = [item for item in filtered_output if item is not None]
-        assert len(filtered_companies) == 3  # Acme (2M), Gamma (5M), Epsilon (1.2M)
-
-        # Verify the correct companies were filtered
         company_names = {company["name"] for company in filtered_companies}
-        expected_names = {"Acme Corp", "Gamma Tech", "Epsilon Inc"}
-        assert company_names == expected_names
-
-    @pytest.mark.asyncio
-    async def test_filter_different_conditions(self, engine, sample_companies):
-        """Test filter with different condition types"""
-        workflow = Workflow(
-            name="test-filter-conditions",
-            version="1.0.0",
-            inputs={"companies": WorkflowInput(input_type="array", required=True)},
-            nodes={
-                "split_companies": Node(
-                    name="split_companies",
-                    type=NodeType.SPLIT,
-                    config=SplitNodeConfig(
-                        field="inputs.companies", item_name="company"
-                    ),
-                ),
-                "filter_tech": Node(
-                    name="filter_tech",
-                    type=NodeType.FILTER,
-                    depends_on=["split_companies"],
-                    config=FilterNodeConfig(
-                        condition="{{ company.industry == 'Technology' }}"
-                    ),
-                ),
-            },
-            outputs={"filtered_result": "filter_tech"},
-        )
-
-        # Execute workflow
-        context = await engine.execute(workflow, {"companies": sample_companies})
-
-        # Verify results
-        assert len(context.errors) == 0, f"Execution errors: {context.errors}"
-
-        filtered_output = context.outputs["filter_tech"]
-        filtered_companies = [item for item in filtered_output if item is not None]
-        assert len(filtered_companies) == 3  # Acme, Gamma, Epsilon are Technology
-
-        # Verify all are Technology companies
-        for company in filtered_companies:
-            assert company["industry"] == "Technology"
+        assert company_names == HIGH_VALUE_NAMES
 
 
 class TestTransformNode:
     """Test transform node functionality"""
 
-    @pytest.mark.asyncio
-    async def test_transform_with_filter(self, engine, sample_companies):
+    async def test_transform_with_filter(self, transformed_pipeline_result):
         """Test transform node working with filtered data"""
-        workflow = Workflow(
-            name="test-transform",
-            version="1.0.0",
-            inputs={"companies": WorkflowInput(input_type="array", required=True)},
-            nodes={
-                "split_companies": Node(
-                    name="split_companies",
-                    type=NodeType.SPLIT,
-                    config=SplitNodeConfig(
-                        field="inputs.companies", item_name="company"
-                    ),
-                ),
-                "filter_high_value": Node(
-                    name="filter_high_value",
-                    type=NodeType.FILTER,
-                    depends_on=["split_companies"],
-                    config=FilterNodeConfig(
-                        condition="{{ company.revenue > 1000000 }}"
-                    ),
-                ),
-                "transform_companies": Node(
-                    name="transform_companies",
-                    type=NodeType.TRANSFORM,
-                    depends_on=["filter_high_value"],
-                    config=TransformNodeConfig(
-                        template={
-                            "company_id": "{{ item.name | replace(' ', '_') | lower }}",
-                            "display_name": "{{ item.name }}",
-                            "revenue_millions": "{{ (item.revenue / 1000000) | round(2) }}",
-                            "size_category": "{% if item.employees > 75 %}large{% elif item.employees > 40 %}medium{% else %}small{% endif %}",
-                        }
-                    ),
-                ),
-            },
-            outputs={"transformed_result": "transform_companies"},
-        )
-
-        # Execute workflow
-        context = await engine.execute(workflow, {"companies": sample_companies})
+        context = transformed_pipeline_result
 
         # Verify results
         assert len(context.errors) == 0, f"Execution errors: {context.errors}"
@@ -283,34 +238,18 @@ class TestTransformNode:
             assert company["size_category"] in ["small", "medium", "large"]
 
         # Verify specific transformations
-        acme = next(c for c in transformed_output if c["display_name"] == "Acme Corp")
+        by_name = {c["display_name"]: c for c in transformed_output}
+        assert by_name.keys() == HIGH_VALUE_NAMES
+        acme = by_name["Acme Corp"]
         assert acme["company_id"] == "acme_corp"
         assert acme["revenue_millions"] == 2.0
         assert acme["size_category"] == "medium"  # 50 employees
 
-    @pytest.mark.asyncio
     async def test_transform_string_template(self, engine, sample_companies):
         """Test transform with string template"""
-        workflow = Workflow(
-            name="test-string-transform",
-            version="1.0.0",
-            inputs={"companies": WorkflowInput(input_type="array", required=True)},
-            nodes={
-                "split_companies": Node(
-                    name="split_companies",
-                    type=NodeType.SPLIT,
-                    config=SplitNodeConfig(
-                        field="inputs.companies", item_name="company"
-                    ),
-                ),
-                "filter_high_value": Node(
-                    name="filter_high_value",
-                    type=NodeType.FILTER,
-                    depends_on=["split_companies"],
-                    config=FilterNodeConfig(
-                        condition="{{ company.revenue > 1000000 }}"
-                    ),
-                ),
+        workflow = split_filter_workflow(
+            "test-string-transform",
+            extra_nodes={
                 "transform_summaries": Node(
                     name="transform_summaries",
                     type=NodeType.TRANSFORM,
@@ -339,46 +278,9 @@ class TestTransformNode:
 class TestAggregateNode:
     """Test aggregate node functionality"""
 
-    @pytest.mark.asyncio
-    async def test_aggregate_array_mode(self, engine, sample_companies):
+    async def test_aggregate_array_mode(self, transformed_pipeline_result):
         """Test aggregate node in array mode"""
-        workflow = Workflow(
-            name="test-aggregate",
-            version="1.0.0",
-            inputs={"companies": WorkflowInput(input_type="array", required=True)},
-            nodes={
-                "split_companies": Node(
-                    name="split_companies",
-                    type=NodeType.SPLIT,
-                    config=SplitNodeConfig(
-                        field="inputs.companies", item_name="company"
-                    ),
-                ),
-                "filter_high_value": Node(
-                    name="filter_high_value",
-                    type=NodeType.FILTER,
-                    depends_on=["split_companies"],
-                    config=FilterNodeConfig(
-                        condition="{{ company.revenue > 1000000 }}"
-                    ),
-                ),
-                "transform_companies": Node(
-                    name="transform_companies",
-                    type=NodeType.TRANSFORM,
-                    depends_on=["filter_high_value"],
-                    config=TransformNodeConfig(
-                        template={
-                            "name": "{{ item.name }}",
-                            "revenue_millions": "{{ (item.revenue / 1000000) | round(1) }}",
-                        }
-                    ),
-                ),
-            },
-            outputs={"final_result": "transform_companies"},
-        )
-
-        # Execute workflow
-        context = await engine.execute(workflow, {"companies": sample_companies})
+        context = transformed_pipeline_result
 
         # Verify results
         assert len(context.errors) == 0, f"Execution errors: {context.errors}"
@@ -389,7 +291,7 @@ class TestAggregateNode:
 
         # Verify each company has expected structure
         for company in result:
-            assert "name" in company
+            assert "display_name" in company
             assert "revenue_millions" in company
             assert isinstance(company["revenue_millions"], int | float)
 
@@ -397,7 +299,6 @@ class TestAggregateNode:
 class TestCompleteDataFlowPipeline:
     """Test complete data flow pipeline end-to-end"""
 
-    @pytest.mark.asyncio
     async def test_complete_pipeline(self, engine):
         """Test a complete data processing pipeline"""
         # Sample FDA violations data
@@ -468,8 +369,9 @@ class TestCompleteDataFlowPipeline:
         assert len(targets) == 2  # Only major and critical violations
 
         # Find specific companies
-        acme_target = next(t for t in targets if t["company"] == "Acme Pharma")
-        beta_target = next(t for t in targets if t["company"] == "Beta Bio")
+        by_company = {t["company"]: t for t in targets}
+        acme_target = by_company["Acme Pharma"]
+        beta_target = by_company["Beta Bio"]
 
         # Verify transformations
         assert acme_target["priority"] == "high"  # major severity
@@ -478,7 +380,6 @@ class TestCompleteDataFlowPipeline:
         assert beta_target["priority"] == "urgent"  # critical severity
         assert beta_target["outreach_type"] == "immediate"  # Warning Letter
 
-    @pytest.mark.asyncio
     async def test_error_handling(self, engine):
         """Test error handling in data flow primitives"""
         workflow = Workflow(
@@ -506,36 +407,4 @@ class TestCompleteDataFlowPipeline:
 
 
 if __name__ == "__main__":
-    # Run a simple test manually
-    import asyncio
-
-    async def manual_test():
-        engine = WorkflowEngine()
-        sample_data = [
-            {"name": "Test Co", "revenue": 2000000, "industry": "Tech", "employees": 50}
-        ]
-
-        workflow = Workflow(
-            name="manual-test",
-            version="1.0.0",
-            inputs={"companies": WorkflowInput(input_type="array", required=True)},
-            nodes={
-                "split_test": Node(
-                    name="split_test",
-                    type=NodeType.SPLIT,
-                    config=SplitNodeConfig(
-                        field="inputs.companies", item_name="company"
-                    ),
-                )
-            },
-            outputs={"result": "split_test"},
-        )
-
-        context = await engine.execute(workflow, {"companies": sample_data})
-        # Manual test results
-        # Success: {len(context.errors) == 0}
-        # Output: {context.outputs}
-        # Errors: {context.errors if context.errors else None}
-        _ = context  # Use context to avoid unused variable warning
-
-    asyncio.run(manual_test())
+    pytest.main([__file__, "-v"])
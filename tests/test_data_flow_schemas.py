@@ -21,6 +21,20 @@ from seriesoftubes.schemas import (
     TransformNodeOutput,
 )
 
+EXPECTED_NODE_TYPES = [
+    "split",
+    "aggregate",
+    "filter",
+    "transform",
+    "join",
+    "foreach",
+    "conditional",
+    "llm",
+    "http",
+    "file",
+    "python",
+]
+
 
 class TestDataFlowSchemas:
     """Test schema definitions and validation for data flow nodes"""
@@ -122,34 +136,20 @@ class TestDataFlowSchemas:
         assert valid_output.selected_route == "high_score_path"
         assert len(valid_output.evaluated_conditions) == 2
 
-    def test_all_nodes_have_schemas(self):
+    @pytest.mark.parametrize("node_type", EXPECTED_NODE_TYPES)
+    def test_all_nodes_have_schemas(self, node_type):
         """Test that all data flow nodes are registered in NODE_SCHEMAS"""
-        expected_nodes = [
-            "split",
-            "aggregate",
-            "filter",
-            "transform",
-            "join",
-            "foreach",
-            "conditional",
-            "llm",
-            "http",
-            "file",
-            "python",
-        ]
-
-        for node_type in expected_nodes:
-            assert (
-                node_type in NODE_SCHEMAS
-            ), f"Node type '{node_type}' missing from NODE_SCHEMAS"
-            assert "input" in NODE_SCHEMAS[node_type]
-            assert "output" in NODE_SCHEMAS[node_type]
-
-            # Verify schema classes are valid
-            input_schema = NODE_SCHEMAS[node_type]["input"]
-            output_schema = NODE_SCHEMAS[node_type]["output"]
-            assert hasattr(input_schema, "model_validate")
-            assert hasattr(output_schema, "model_validate")
+        assert (
+            node_type in NODE_SCHEMAS
+        ), f"Node type '{node_type}' missing from NODE_SCHEMAS"
+        assert "input" in NODE_SCHEMAS[node_type]
+        assert "output" in NODE_SCHEMAS[node_type]
+
+        # Verify schema classes are valid
+        input_schema = NODE_SCHEMAS[node_type]["input"]
+        output_schema = NODE_SCHEMAS[node_type]["output"]
+        assert hasattr(input_schema, "model_validate")
+        assert hasattr(output_schema, "model_validate")
 
     def test_schema_inheritance(self):
         """Test that all schemas inherit from base classes"""
@@ -1,11 +1,11 @@
 """Tests for the workflow execution engine"""
 
 import json
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from seriesoftubes.engine import ExecutionContext, WorkflowEngine, run_workflow
+from seriesoftubes.engine import ExecutionContext, _dump_json, run_workflow
 from seriesoftubes.models import (
     Node,
     NodeType,
@@ -16,6 +16,21 @@ from seriesoftubes.models import (
 from seriesoftubes.nodes import NodeResult
 
 
+class StubExecutor:
+    """Executor stand-in that returns a fixed result and counts calls"""
+
+    def __init__(self, result: NodeResult):
+        self.result = result
+        self.calls = 0
+
+    async def execute(self, node, context) -> NodeResult:
+        self.calls += 1
+        return self.result
+
+    def prepare_context_data(self, node, context) -> dict:
+        return {}
+
+
 @pytest.fixture
 def simple_workflow():
     """Create a simple test workflow"""
@@ -30,7 +45,6 @@ def simple_workflow():
             "python_node": Node(
                 name="python_node",
                 type=NodeType.PYTHON,
-                depends_on=[],
                 config=PythonNodeConfig(
                     code="result = {'result': 'hello_path' if inputs['text'] == 'hello' else 'default_path'}"
                 ),
@@ -76,18 +90,15 @@ class TestExecutionContext:
 class TestWorkflowEngine:
     """Test WorkflowEngine class"""
 
-    def test_engine_initialization(self):
+    def test_engine_initialization(self, engine):
         """Test engine initialization"""
-        engine = WorkflowEngine()
         assert NodeType.LLM in engine.executors
         assert NodeType.HTTP in engine.executors
         assert NodeType.PYTHON in engine.executors
         assert NodeType.FILE in engine.executors
 
-    def test_validate_inputs(self, simple_workflow):
+    def test_validate_inputs(self, engine, simple_workflow):
         """Test input validation"""
-        engine = WorkflowEngine()
-
         # Valid inputs
         validated = engine._validate_inputs(
             simple_workflow, {"text": "hello", "extra": "ignored"}
@@ -102,17 +113,14 @@ class TestWorkflowEngine:
         validated = engine._validate_inputs(simple_workflow, {"text": "hello"})
         assert validated["optional"] == "default_value"
 
-    @pytest.mark.asyncio
-    async def test_execute_workflow(self, simple_workflow):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_execute_workflow(self, engine, simple_workflow, monkeypatch):
         """Test executing a workflow"""
-        engine = WorkflowEngine()
-
-        # Mock the python executor
-        mock_executor = AsyncMock()
-        mock_executor.execute.return_value = NodeResult(
-            output={"result": "hello_path"}, success=True
+        # Stub the python executor
+        stub_executor = StubExecutor(
+            NodeResult(output={"result": "hello_path"}, success=True)
         )
-        engine.executors[NodeType.PYTHON] = mock_executor
+        monkeypatch.setitem(engine.executors, NodeType.PYTHON, stub_executor)
 
         # Execute workflow
         context = await engine.execute(simple_workflow, {"text": "hello"})
@@ -120,19 +128,16 @@ class TestWorkflowEngine:
         # Check results
         assert context.outputs["python_node"] == {"result": "hello_path"}
         assert len(context.errors) == 0
-        mock_executor.execute.assert_called_once()
+        assert stub_executor.calls == 1
 
-    @pytest.mark.asyncio
-    async def test_execute_with_error(self, simple_workflow):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_execute_with_error(self, engine, simple_workflow, monkeypatch):
         """Test executing a workflow with an error"""
-        engine = WorkflowEngine()
-
-        # Mock executor to return an error
-        mock_executor = AsyncMock()
-        mock_executor.execute.return_value = NodeResult(
-            output=None, success=False, error="Test error"
+        # Stub executor to return an error
+        stub_executor = StubExecutor(
+            NodeResult(output=None, success=False, error="Test error")
         )
-        engine.executors[NodeType.PYTHON] = mock_executor
+        monkeypatch.setitem(engine.executors, NodeType.PYTHON, stub_executor)
 
         # Execute workflow
         context = await engine.execute(simple_workflow, {"text": "hello"})
@@ -207,3 +212,14 @@ async def test_run_workflow_no_save(simple_workflow, tmp_path):
 
         # Ensure no files were created for this execution
         assert not (tmp_path / "outputs" / "test-id").exists()
+
+
+def test_dump_json_matches_stdlib_output():
+    """Saved JSON decodes the same whichever encoder wrote it"""
+    data = {"text": "héllo", "counts": {1: "one"}, "items": [1.5, None, True]}
+
+    assert json.loads(_dump_json(data)) == json.loads(json.dumps(data))
+
+    # Values neither encoder can handle still fail loudly
+    with pytest.raises(TypeError):
+        _dump_json({"items": {1, 2}})
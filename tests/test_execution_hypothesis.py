@@ -1,32 +1,36 @@
 import pytest
-from hypothesis import assume, given, settings
+from hypothesis import given, settings
 from hypothesis import strategies as st
 
-from seriesoftubes.engine import WorkflowEngine
 from seriesoftubes.models import Node, NodeType, PythonNodeConfig, Workflow
 
+MAX_PARALLEL_NODES = 4
+
+# Node "node_i" is the same in every example, so validate each one only once
+PARALLEL_NODES = {
+    f"node_{i}": Node(
+        name=f"node_{i}",
+        type=NodeType.PYTHON,
+        config=PythonNodeConfig(code=f"result = {{'id': {i}, 'executed': True}}"),
+    )
+    for i in range(MAX_PARALLEL_NODES)
+}
+
 
 @given(
-    num_parallel_nodes=st.integers(min_value=2, max_value=4),
+    num_parallel_nodes=st.integers(min_value=2, max_value=MAX_PARALLEL_NODES),
 )
 @settings(deadline=5000)  # 5 second deadline for process overhead
-@pytest.mark.asyncio
-async def test_parallel_execution_functionality(num_parallel_nodes):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_parallel_execution_functionality(engine, num_parallel_nodes):
     """Parallel execution should execute all independent nodes successfully"""
     
     # Create workflow with N independent nodes that each return their ID
-    nodes = {}
-    for i in range(num_parallel_nodes):
-        nodes[f"node_{i}"] = Node(
-            name=f"node_{i}",
-            type=NodeType.PYTHON,
-            config=PythonNodeConfig(
-                code=f"result = {{'id': {i}, 'executed': True}}"
-            ),
-        )
+    nodes = {
+        f"node_{i}": PARALLEL_NODES[f"node_{i}"] for i in range(num_parallel_nodes)
+    }
 
     workflow = Workflow(name="parallel-test", version="1.0.0", nodes=nodes)
-    engine = WorkflowEngine()
     
     context = await engine.execute(workflow, {})
 
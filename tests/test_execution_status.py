@@ -2,21 +2,16 @@
 Test execution status tracking functionality
 """
 
-import asyncio
-import tempfile
-from pathlib import Path
-
 import pytest
 
-from seriesoftubes.engine import WorkflowEngine
-from seriesoftubes.parser import parse_workflow_yaml
+from seriesoftubes.parser import parse_workflow_yaml_str
 
 
 class TestExecutionStatus:
     """Test execution status and progress tracking"""
 
-    @pytest.mark.asyncio
-    async def test_basic_execution_status(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_basic_execution_status(self, engine):
         """Test that basic execution works with our changes"""
 
         # Create a simple test workflow
@@ -42,27 +37,17 @@ outputs:
   result: echo.result
 """
 
-        # Write to temporary file
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(test_workflow_yaml)
-            temp_path = Path(f.name)
-
-        try:
-            # Parse workflow
-            workflow = parse_workflow_yaml(temp_path)
-            assert workflow.name == "status-test"
-
-            # Test basic engine execution
-            engine = WorkflowEngine()
-            context = await engine.execute(workflow, {"message": "Test message"})
+        # Parse workflow
+        workflow = parse_workflow_yaml_str(test_workflow_yaml)
+        assert workflow.name == "status-test"
 
-            # Verify execution completed successfully
-            assert len(context.errors) == 0
-            assert "echo" in context.outputs
-            assert context.outputs["echo"]["result"]["result"] == "Echo: Test message"
+        # Test basic engine execution
+        context = await engine.execute(workflow, {"message": "Test message"})
 
-        finally:
-            temp_path.unlink()
+        # Verify execution completed successfully
+        assert len(context.errors) == 0
+        assert "echo" in context.outputs
+        assert context.outputs["echo"]["result"]["result"] == "Echo: Test message"
 
     def test_database_progress_tracking_engine_import(self):
         """Test that DatabaseProgressTrackingEngine can be imported"""
@@ -71,8 +56,8 @@ outputs:
         # Test the class exists and can be instantiated (with mock session)
         assert DatabaseProgressTrackingEngine is not None
 
-    @pytest.mark.asyncio
-    async def test_multi_node_execution(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_multi_node_execution(self, engine):
         """Test execution with multiple nodes to verify progress tracking works"""
 
         multi_node_yaml = """
@@ -103,43 +88,16 @@ outputs:
   result: triple.tripled
 """
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(multi_node_yaml)
-            temp_path = Path(f.name)
-
-        try:
-            workflow = parse_workflow_yaml(temp_path)
-            engine = WorkflowEngine()
-            context = await engine.execute(workflow, {"number": 5})
-
-            # Verify both nodes executed
-            assert len(context.errors) == 0
-            assert "double" in context.outputs
-            assert "triple" in context.outputs
-            assert context.outputs["double"]["result"]["doubled"] == 10
-            assert context.outputs["triple"]["result"]["tripled"] == 30
+        workflow = parse_workflow_yaml_str(multi_node_yaml)
+        context = await engine.execute(workflow, {"number": 5})
 
-        finally:
-            temp_path.unlink()
+        # Verify both nodes executed
+        assert len(context.errors) == 0
+        assert "double" in context.outputs
+        assert "triple" in context.outputs
+        assert context.outputs["double"]["result"]["doubled"] == 10
+        assert context.outputs["triple"]["result"]["tripled"] == 30
 
 
 if __name__ == "__main__":
-    # Manual execution for debugging
-    import asyncio
-
-    async def manual_test():
-        """Manual test function for debugging"""
-        test_instance = TestExecutionStatus()
-
-        await test_instance.test_basic_execution_status()
-        test_instance.test_database_progress_tracking_engine_import()
-        await test_instance.test_multi_node_execution()
-
-        return True
-
-    success = asyncio.run(manual_test())
-    if success:
-        print("\n✅ All execution status tests passed!")
-    else:
-        print("\n❌ Execution status tests failed!")
-        exit(1)
+    pytest.main([__file__, "-v"])
@@ -5,7 +5,12 @@ from pathlib import Path
 import pytest
 
 from seriesoftubes.models import NodeType
-from seriesoftubes.parser import WorkflowParseError, parse_workflow_yaml, validate_dag
+from seriesoftubes.parser import (
+    WorkflowParseError,
+    parse_workflow_yaml,
+    parse_workflow_yaml_str,
+    validate_dag,
+)
 
 
 def test_parse_simple_workflow():
@@ -60,6 +65,28 @@ def test_parse_invalid_yaml(tmp_path):
         parse_workflow_yaml(invalid_yaml)
 
 
+def test_parse_workflow_yaml_str():
+    """Test parsing workflow YAML held in a string"""
+    workflow = parse_workflow_yaml_str(
+        """
+name: from-string
+nodes:
+  echo:
+    type: python
+    config:
+      code: "result = 1"
+"""
+    )
+    assert workflow.name == "from-string"
+    assert workflow.nodes["echo"].node_type == NodeType.PYTHON
+
+    with pytest.raises(WorkflowParseError, match="Invalid YAML"):
+        parse_workflow_yaml_str("{ invalid yaml :")
+
+    with pytest.raises(WorkflowParseError, match="must be a YAML object"):
+        parse_workflow_yaml_str("- just\n- a list\n")
+
+
 def test_missing_required_fields(tmp_path):
     """Test parsing with missing required fields"""
     incomplete_yaml = tmp_path / "incomplete.yaml"
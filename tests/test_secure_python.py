@@ -280,4 +280,22 @@ except Exception as e:
 """
         # Pass empty dict so 'context' variable exists in namespace
         result = execute_secure_python(code, context={"dummy": "value"})
-        assert result == "division by zero handled"
\ No newline at end of file
+        assert result == "division by zero handled"
+
+    def test_compiled_code_is_reused(self):
+        """Test that code is validated and compiled once per security level"""
+        engine = SecurePythonEngine()
+        code = """
+import math
+result = math.floor(x)
+"""
+        assert engine.execute(code, {"x": 1.5}) == 1
+        assert engine.execute(code, {"x": 2.5}) == 2
+
+        cache_info = engine._compile.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
+
+        # A cached compile at one level must not let the code run at another
+        with pytest.raises(CodeValidationError):
+            engine.execute(code, {"x": 1.5}, level=PythonSecurityLevel.STRICT)
@@ -185,4 +185,19 @@ class TestSecureTemplateEngine:
         )
         
         captured = capsys.readouterr()
-        assert "WARNING: Unsafe template rendering in test-node node" in captured.out
\ No newline at end of file
+        assert "WARNING: Unsafe template rendering in test-node node" in captured.out
+    def test_compiled_templates_are_reused(self):
+        """Test that rendering a template twice compiles it only once"""
+        engine = SecureTemplateEngine()
+
+        for company in ("Acme", "Globex"):
+            result = engine.render(
+                "{{ name | upper }}",
+                {"name": company},
+                level=TemplateSecurityLevel.SAFE_EXPRESSIONS
+            )
+            assert result == company.upper()
+
+        cache_info = engine._compile_safe.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits >= 1